@@ -3,6 +3,11 @@ from discord.ext import commands
 import json
 import aiohttp
 import logging
+from deadline import DEFAULT_DEADLINE, StaleWhileRevalidate, auto_defer
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream API gives an unusable response."""
 
 
 class Fun(commands.Cog):
@@ -19,29 +24,48 @@ class Fun(commands.Cog):
             "Cat-API": self.config["CAT_API_KEY"],
             "Accept": 'application/json',
         }
+        self.responses = StaleWhileRevalidate(
+            deadline=self.config.get("UPSTREAM_DEADLINE_SECONDS", DEFAULT_DEADLINE),
+            maxsize=self.config.get("UPSTREAM_CACHE_SIZE", 128),
+        )
 
     @staticmethod
     def load_config():
         with open('./config.json', 'r') as config_file:
             return json.load(config_file)
 
-    def cog_unload(self):
-        self.bot.loop.create_task(self.session.close())
+    def export_state(self):
+        """Warm state handed to the next instance of this cog when it is hot reloaded."""
+        return {"responses": self.responses.export()}
+
+    async def cog_load(self):
+        state = self.bot.take_cog_state(self.qualified_name)
+        if state is not None:
+            self.responses.load(state["responses"])
+
+    async def cog_unload(self):
+        await self.session.close()
 
     @staticmethod
     def _is_non_empty_list(data):
         return isinstance(data, list) and bool(data)
 
-    async def _fetch_data(self, url, headers=None, data_type='json'):
+    async def _request(self, url, headers=None, data_type='json'):
         try:
             async with self.session.get(url, headers=headers) as response:
                 if response.status == 200:
                     return await getattr(response, data_type)()
-                else:
-                    return f"Error fetching API.\n* **Status Code:** {response.status}"
+                raise UpstreamError(f"Error fetching API.\n* **Status Code:** {response.status}")
         except aiohttp.ClientError as e:
             self.logger.error(f"Request error: {e}")
-            return "Error fetching API. Please try again later."
+            raise UpstreamError("Error fetching API. Please try again later.") from e
+
+    async def _fetch_data(self, url, headers=None, data_type='json'):
+        """Fetch an upstream response, serving the last good one if the upstream is slow or failing."""
+        try:
+            return await self.responses.get(url, lambda: self._request(url, headers, data_type))
+        except UpstreamError as e:
+            return str(e)
 
     async def _process_image(self, ctx, data):
         if isinstance(data, str):
@@ -73,12 +97,14 @@ class Fun(commands.Cog):
         return embed
 
     @commands.hybrid_command(name="insult", with_app_command=True, description="Get a random insult")
+    @auto_defer()
     async def insult(self, ctx):
         insult_data = await self._fetch_data(self.config['INSULT_API_URL'], data_type='text')
         embed = await self._create_embed(insult_data)
         await ctx.reply(embed=embed)
 
     @commands.hybrid_command(name="buzzword", with_app_command=True, description="Get a random buzzword")
+    @auto_defer()
     async def buzzword(self, ctx):
         buzzword_data = await self._fetch_data(self.config['BUZZWORD_API_URL'])
         if isinstance(buzzword_data, str):
@@ -92,6 +118,7 @@ class Fun(commands.Cog):
                 await ctx.reply("Error extracting phrase from Buzzword API response.")
 
     @commands.hybrid_command(name="joke", with_app_command=True, description="Get a random joke")
+    @auto_defer()
     async def joke(self, ctx):
         joke_data = await self._fetch_data(self.config['JOKE_API_URL'])
         if isinstance(joke_data, str):
@@ -116,16 +143,19 @@ class Fun(commands.Cog):
                 await ctx.reply("Error extracting joke from Joke API response.")
 
     @commands.hybrid_command(name="dog", with_app_command=True, description="Get a random dog image")
+    @auto_defer()
     async def dog(self, ctx):
         data = await self._fetch_data(self.config['DOG_API_URL'], headers=self.headers)
         await self._process_image(ctx, data)
 
     @commands.hybrid_command(name="cat", with_app_command=True, description="Get a random cat image")
+    @auto_defer()
     async def cat(self, ctx):
         data = await self._fetch_data(self.config['CAT_API_URL'], headers=self.headers)
         await self._process_image(ctx, data)
 
     @commands.hybrid_command(name="meme", with_app_command=True, description="Get a random meme")
+    @auto_defer()
     async def meme(self, ctx):
         meme_data = await self._fetch_data(self.config['MEME_API_URL'])
 
@@ -147,6 +177,7 @@ class Fun(commands.Cog):
             await ctx.reply("Unexpected response from Meme API.")
 
     @commands.hybrid_command(name="age", with_app_command=True, description="Get the age of a person")
+    @auto_defer()
     async def age(self, ctx, name):
         if name.lower() in ['noah']:
             embed = await self._create_embed(
@@ -175,6 +206,7 @@ class Fun(commands.Cog):
             await ctx.reply(embed=embed)
 
     @commands.hybrid_command(name="country", with_app_command=True, description="Get information about a country")
+    @auto_defer()
     async def country(self, ctx, *, country_name: str):
         if country_name.lower() in ["africa", "african"]:
             embed = await self._create_embed(
@@ -204,6 +236,7 @@ class Fun(commands.Cog):
                 await ctx.reply("No information available for the specified country.")
 
     @commands.hybrid_command(name="trump", with_app_command=True, description="Get a random quote from Donald Trump")
+    @auto_defer()
     async def trump(self, ctx):
         quote_data = await self._fetch_data(self.config['TRONALD_DUMP_API_URL'], headers=self.headers)
         if isinstance(quote_data, str):
@@ -217,6 +250,7 @@ class Fun(commands.Cog):
             await ctx.reply(embed=embed)
 
     @commands.hybrid_command(name="fact", with_app_command=True, description="Get a random fact")
+    @auto_defer()
     async def fact(self, ctx):
         fact_data = await self._fetch_data(self.config['FACT_API_URL'])
         if isinstance(fact_data, str):
@@ -227,6 +261,7 @@ class Fun(commands.Cog):
             await ctx.reply(embed=embed)
 
     @commands.hybrid_command(name="quote", with_app_command=True, description="Get a random quote")
+    @auto_defer()
     async def quote(self, ctx):
         quote_data = await self._fetch_data(self.config['QUOTE_API_URL'])
         if isinstance(quote_data, str):
@@ -240,6 +275,7 @@ class Fun(commands.Cog):
             await ctx.reply(embed=embed)
 
     @commands.hybrid_command(name="urban", with_app_command=True, description="Get a definition from Urban Dictionary")
+    @auto_defer()
     async def urban(self, ctx, *, term):
         term = term.replace(" ", "+")
         url = f"{self.config['URBAN_DICTIONARY_API_URL']}{term}"
@@ -0,0 +1,69 @@
+import discord
+from discord.ext import commands
+
+
+class Settings(commands.Cog):
+    def __init__(self, bot_instance):
+        self.bot = bot_instance
+
+    async def cog_check(self, ctx):
+        """Every settings command needs Manage Server in a guild, for both prefix and slash invocations."""
+        if ctx.guild is None:
+            raise commands.NoPrivateMessage()
+        if not ctx.author.guild_permissions.manage_guild:
+            raise commands.MissingPermissions(['manage_guild'])
+        return True
+
+    @staticmethod
+    def _mention(value, kind):
+        if value is None:
+            return "Not set"
+        return f"<#{value}>" if kind == "channel" else f"<@&{value}>"
+
+    async def _update(self, ctx, field, value, label):
+        await self.bot.guild_settings.update(ctx.guild.id, **{field: value})
+        await ctx.reply(f"{label} {'cleared' if value is None else 'updated'}.")
+
+    @commands.hybrid_group(name='settings', description='Show or change this server\'s bot settings')
+    async def settings_command(self, ctx):
+        if not ctx.invoked_subcommand:
+            await self.show_settings(ctx)
+
+    @settings_command.command(name='show', description='Show this server\'s bot settings')
+    async def show_settings(self, ctx):
+        settings = await self.bot.guild_settings.get(ctx.guild.id)
+        support_role = self._mention(settings.support_role_id, "role") if settings.support_role_id \
+            else f"Any role named `{settings.support_role_name}`"
+
+        embed = discord.Embed(title="Server Settings", color=discord.Color.from_rgb(43, 45, 49))
+        embed.add_field(name="Support Role", value=support_role, inline=False)
+        embed.add_field(name="Report Channel", value=self._mention(settings.report_channel_id, "channel"), inline=False)
+        embed.add_field(name="Report Ping Role", value=self._mention(settings.report_ping_role_id, "role"),
+                        inline=False)
+        embed.add_field(name="Quick Delete Role", value=self._mention(settings.delete_role_id, "role"), inline=False)
+        embed.add_field(name="Support Forum", value=self._mention(settings.support_forum_id, "channel"), inline=False)
+        await ctx.reply(embed=embed)
+
+    @settings_command.command(name='support-role', description='Set the role that can manage tags and use /sentry')
+    async def set_support_role(self, ctx, role: discord.Role = None):
+        await self._update(ctx, "support_role_id", role.id if role else None, "Support role")
+
+    @settings_command.command(name='report-channel', description='Set the channel that receives ⚠️ reports')
+    async def set_report_channel(self, ctx, channel: discord.TextChannel = None):
+        await self._update(ctx, "report_channel_id", channel.id if channel else None, "Report channel")
+
+    @settings_command.command(name='report-ping', description='Set the role pinged for new reports')
+    async def set_report_ping(self, ctx, role: discord.Role = None):
+        await self._update(ctx, "report_ping_role_id", role.id if role else None, "Report ping role")
+
+    @settings_command.command(name='delete-role', description='Set the role that can quick delete reported messages')
+    async def set_delete_role(self, ctx, role: discord.Role = None):
+        await self._update(ctx, "delete_role_id", role.id if role else None, "Quick delete role")
+
+    @settings_command.command(name='support-forum', description='Set the forum whose idle threads are closed')
+    async def set_support_forum(self, ctx, forum: discord.ForumChannel = None):
+        await self._update(ctx, "support_forum_id", forum.id if forum else None, "Support forum")
+
+
+async def setup(bot_instance):
+    await bot_instance.add_cog(Settings(bot_instance))
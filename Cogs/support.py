@@ -1,36 +1,51 @@
 import json
 import asyncio
-from datetime import datetime, timezone
-from discord.utils import format_dt
-from motor.motor_asyncio import AsyncIOMotorClient
-import re
 import os
-from dotenv import load_dotenv
+from datetime import datetime, timezone
+from discord.utils import format_dt, snowflake_time
+import time
+from typing import Literal
 from menus import TagListPaginator, DeleteButton
+from cache import LRUCache
+from deadline import DEFAULT_DEADLINE, StaleWhileRevalidate, auto_defer
+from tag_io import TagImportError, TagImportSummary, export_tags, import_tags
+from tag_search import TagSearchIndex
+from tag_usage import TagUsageTracker
+from thread_sweeper import ThreadSweeper
+from sentry_webhook import SentryErrorIndex, SentryWebhookServer
+from guild_settings import is_support
 import discord
 import aiohttp
-from discord.ext import commands
+from discord.ext import commands, tasks
+from pymongo.errors import PyMongoError
 
-load_dotenv()
 
 class Support(commands.Cog):
     def __init__(self, bot_instance):
         self.bot = bot_instance
         self.config = self.load_config()
         self.session = self.bot.session
-        mongo_uri = os.getenv('MONGO_URI')
-        self.client = AsyncIOMotorClient(mongo_uri)
-        self.database = self.client["Cronus"]
-        self.collection = self.database["threads"]
-        self.tag_collection = self.database["tags"]
+        self.collection = self.bot.db.threads
+        self.tag_collection = self.bot.db.tags
         self.headers = {"Authorization": f"Bearer {self.config['SENTRY_API_KEY']}"}
-        self.closed_threads = set()
         self.last_report_times = {}
-        self.last_reaction_time = datetime.min
-        self.guild_id = 987798554972143728
-        self.parent_id = 1192661461827326073
-        self.target_role_id = 988055417907200010
-        self.create_indexes()
+        self.last_reaction_times = {}
+        # Tag names, cache entries and usage counters are keyed by (guild_id, name); search has one index per guild.
+        self.tag_cache = LRUCache(self.config.get("TAG_CACHE_SIZE", 256))
+        self.tag_names = {}
+        self.tag_search = {}
+        self.tag_usage = TagUsageTracker(self.tag_collection, logger=self.bot.logger)
+        self.thread_sweeper = ThreadSweeper(self.bot, self.collection, self.config, logger=self.bot.logger)
+        self.sentry_index = SentryErrorIndex(
+            self.bot.db.sentry_errors,
+            error_id_tag=self.config.get("SENTRY_ERROR_ID_TAG", "error_id"),
+            logger=self.bot.logger,
+        )
+        self.sentry_webhook = None
+        self.issue_cache = StaleWhileRevalidate(
+            deadline=self.config.get("UPSTREAM_DEADLINE_SECONDS", DEFAULT_DEADLINE),
+            maxsize=self.config.get("UPSTREAM_CACHE_SIZE", 128),
+        )
 
     @staticmethod
     def load_config():
@@ -38,6 +53,158 @@ class Support(commands.Cog):
         with open('./config.json', 'r') as config_file:
             return json.load(config_file)
 
+    def export_state(self):
+        """Warm state handed to the next instance of this cog when it is hot reloaded."""
+        return {
+            "tag_names": self.tag_names,
+            "tag_search": self.tag_search,
+            "tag_cache": self.tag_cache.items(),
+            "issue_cache": self.issue_cache.export(),
+            "last_report_times": self.last_report_times,
+            "last_reaction_times": self.last_reaction_times,
+        }
+
+    def import_state(self, state):
+        self.tag_names.update(state["tag_names"])
+        self.tag_search = state["tag_search"]
+        for key, tag in state["tag_cache"]:
+            self.tag_cache.set(key, tag)
+        self.issue_cache.load(state["issue_cache"])
+        self.last_report_times = state["last_report_times"]
+        self.last_reaction_times = state["last_reaction_times"]
+
+    async def cog_load(self):
+        """Restore handed-off state or load the tag tables and pre-warm the tag cache, then start the loops."""
+        state = self.bot.take_cog_state(self.qualified_name)
+        if state is not None:
+            self.import_state(state)
+            self.bot.logger.info(f"Restored {len(self.tag_cache)} cached tags from the previous instance.")
+        else:
+            await self.load_tags()
+            hot_tags = await self.tag_usage.hot_tags(self.config.get("TAG_CACHE_PREWARM", 50))
+            for tag in hot_tags:
+                self.tag_cache.set((tag.get("guild_id"), tag["name"].lower()), tag)
+            self.bot.logger.info(f"Pre-warmed tag cache with {len(hot_tags)} tags.")
+
+        self.flush_tag_usage.change_interval(seconds=self.config.get("TAG_USAGE_FLUSH_SECONDS", 60))
+        self.flush_tag_usage.start()
+        # Listeners only enqueue; these pools bound how much handler work a burst of events can start.
+        self.bot.create_work_queue('reports', self.handle_report, maxsize=100, concurrency=2,
+                                   policy='coalesce', timeout=30)
+        self.bot.create_work_queue('thread_activity', self.record_thread_activity, maxsize=1000, concurrency=1,
+                                   policy='coalesce', timeout=10)
+        self.bot.create_work_queue('tags', self.run_routed_tag, maxsize=200, concurrency=4, policy='drop', timeout=30)
+        self.bot.router.register('tag', self.tag_names, self.dispatch_tag, match='remainder', scoped=True)
+
+        self.sweep_threads.change_interval(minutes=self.config.get("THREAD_SWEEP_INTERVAL_MINUTES", 30))
+        self.sweep_threads.start()
+
+        await self.start_sentry_webhook()
+
+    async def cog_unload(self):
+        """Stop the background loops and write out whatever they have not flushed yet."""
+        self.bot.router.unregister('tag')
+        for queue_name in ('reports', 'thread_activity', 'tags'):
+            await self.bot.close_work_queue(queue_name)
+        self.flush_tag_usage.cancel()
+        self.sweep_threads.cancel()
+        await self.tag_usage.flush()
+        await self.thread_sweeper.flush()
+        if self.sentry_webhook is not None:
+            await self.sentry_webhook.stop()
+
+    async def start_sentry_webhook(self):
+        """Start the Sentry webhook receiver if a signing secret is configured."""
+        secret = os.getenv("SENTRY_WEBHOOK_SECRET")
+        if not secret:
+            self.bot.logger.info("SENTRY_WEBHOOK_SECRET is not set; /sentry will poll Sentry only.")
+            return
+
+        self.sentry_webhook = SentryWebhookServer(
+            self.sentry_index,
+            secret,
+            host=self.config.get("SENTRY_WEBHOOK_HOST", "0.0.0.0"),
+            port=self.config.get("SENTRY_WEBHOOK_PORT", 80),
+            path=self.config.get("SENTRY_WEBHOOK_PATH", "/sentry/webhook"),
+            logger=self.bot.logger,
+        )
+        try:
+            await self.sentry_webhook.start()
+        except OSError as e:
+            self.bot.logger.error(f"Failed to start the Sentry webhook server: {e}")
+            self.sentry_webhook = None
+
+    async def support_forums(self):
+        """Yield ``(guild, forum_id)`` for every guild the bot is in that has a support forum configured."""
+        for settings in await self.bot.guild_settings.guilds_with("support_forum_id"):
+            guild = self.bot.get_guild(settings.guild_id)
+            if guild is not None:
+                yield guild, settings.support_forum_id
+
+    async def support_forum_id(self, guild_id):
+        if guild_id is None:
+            return None
+        return (await self.bot.guild_settings.get(guild_id)).support_forum_id
+
+    @tasks.loop(minutes=30)
+    async def sweep_threads(self):
+        async for guild, forum_id in self.support_forums():
+            try:
+                closed = await self.thread_sweeper.sweep(guild, forum_id)
+            except Exception as e:
+                self.bot.logger.error(f"Thread sweep failed in guild {guild.id}: {e}")
+                continue
+
+            if closed:
+                self.bot.logger.info(f"Closed {len(closed)} idle support threads in guild {guild.id}.")
+
+    @sweep_threads.before_loop
+    async def before_sweep_threads(self):
+        await self.bot.wait_until_ready()
+        async for guild, forum_id in self.support_forums():
+            try:
+                await self.thread_sweeper.backfill(guild, forum_id)
+            except Exception as e:
+                self.bot.logger.error(f"Failed to backfill support threads in guild {guild.id}: {e}")
+
+    @commands.Cog.listener('on_message')
+    async def track_thread_activity(self, message):
+        if isinstance(message.channel, discord.Thread):
+            # Only the newest message per thread matters, so a busy thread takes one queue slot.
+            self.bot.work_queues['thread_activity'].submit(message, key=message.channel.id)
+
+    async def record_thread_activity(self, message):
+        if self.thread_sweeper.is_tracked(message.channel, await self.support_forum_id(message.guild.id)):
+            self.thread_sweeper.track(message.channel, activity=message.created_at)
+
+    @commands.Cog.listener()
+    async def on_thread_create(self, thread):
+        if self.thread_sweeper.is_tracked(thread, await self.support_forum_id(thread.guild.id)):
+            self.thread_sweeper.track(thread, activity=thread.created_at or snowflake_time(thread.id))
+
+    @commands.Cog.listener()
+    async def on_thread_update(self, before, after):
+        if before.archived == after.archived:
+            return
+        if not self.thread_sweeper.is_tracked(after, await self.support_forum_id(after.guild.id)):
+            return
+
+        # Threads the sweeper archived arrive here too; recording archived=True again is harmless.
+        activity = None if after.archived else datetime.now(timezone.utc)
+        self.thread_sweeper.track(after, activity=activity, archived=after.archived)
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload):
+        forum_id = await self.support_forum_id(payload.guild_id)
+        if forum_id is not None and payload.parent_id == forum_id:
+            await self.thread_sweeper.forget(payload.thread_id)
+
+    @tasks.loop(seconds=60)
+    async def flush_tag_usage(self):
+        flushed = await self.tag_usage.flush()
+        if flushed:
+            self.bot.logger.debug(f"Flushed usage for {flushed} tags.")
+
     async def _fetch_issues(self, error_id: str):
         url = f"{self.config['SENTRY_API_URL']}/projects/{self.config['SENTRY_ORGANIZATION_SLUG']}/" \
               f"{self.config['PROJECT_SLUG']}/issues/"
@@ -56,6 +223,19 @@ class Support(commands.Cog):
             self.bot.logger.error(f"Error fetching issues: {e}")
             return None
 
+    async def _fetch_issues_cached(self, error_id: str):
+        """Fetch issues for an error ID, answering from the last good result while Sentry is slow."""
+        async def _fetch():
+            issues = await self._fetch_issues(error_id)
+            if not issues:
+                raise LookupError(error_id)
+            return issues
+
+        try:
+            return await self.issue_cache.get(error_id, _fetch)
+        except LookupError:
+            return None
+
     def _process_response(self, issues):
         """Process the response from the Sentry API."""
         if not issues:
@@ -93,22 +273,44 @@ class Support(commands.Cog):
             return None
 
     @staticmethod
-    async def _update_ui(loading, title, value, handled, last_seen, error_url):
+    def _create_issue_embed(title, value, handled, last_seen, error_url):
         embed = discord.Embed(title=f"Sentry Issue: {title}", color=discord.Color.from_rgb(43, 45, 49))
         embed.add_field(name="Value", value=value, inline=False)
         embed.add_field(name="Unhandled", value=handled, inline=False)
         embed.add_field(name="Last Seen", value=last_seen, inline=False)
         embed.add_field(name="Sentry URL", value=error_url, inline=False)
-        await loading.edit(content=None, embed=embed)
+        return embed
+
+    async def _update_ui(self, loading, title, value, handled, last_seen, error_url):
+        await loading.edit(content=None, embed=self._create_issue_embed(title, value, handled, last_seen, error_url))
+
+    async def _lookup_local_issue(self, error_id: str):
+        """Return the embed for an error ID already delivered by a Sentry webhook, or None."""
+        try:
+            issues = await self.sentry_index.lookup(error_id)
+        except Exception as e:
+            self.bot.logger.error(f"Error reading the local Sentry index: {e}")
+            return None
+
+        if not issues:
+            return None
+        issue_data = self._process_response(issues)
+        error_url = self.generate_error_url(self._get_issue_id_from_response(issues))
+        return self._create_issue_embed(*issue_data, error_url)
 
     @commands.hybrid_command(name="sentry", description="Get a Sentry issue by error ID")
-    @commands.has_any_role('Support')
+    @is_support()
+    @auto_defer()
     async def sentry(self, ctx, error_id: str):
+        local_embed = await self._lookup_local_issue(error_id)
+        if local_embed is not None:
+            return await ctx.reply(embed=local_embed)
+
         loading = await ctx.reply(content=f"Fetching...")
 
         async def _fetch_issues_with_retry(error_id_param: str, max_attempts: int = 4, initial_retry_interval: int = 2):
             for attempt in range(1, max_attempts + 1):
-                issues = await self._fetch_issues(error_id_param)
+                issues = await self._fetch_issues_cached(error_id_param)
 
                 if issues is not None:
                     issue_data = self._process_response(issues)
@@ -133,20 +335,25 @@ class Support(commands.Cog):
 
     @commands.Cog.listener()
     async def on_raw_reaction_add(self, payload):
+        if payload.guild_id is None or str(payload.emoji) != '⚠️':
+            return
+        # Repeated reports of one message collapse into the one already waiting in the queue.
+        self.bot.work_queues['reports'].submit(payload, key=payload.message_id)
+
+    async def handle_report(self, payload):
         now = datetime.now()
         cooldown_time = 120
         report_cooldown_time = 20 * 60
-        report_channel_id = 988056281900257300
 
-        if (now - self.last_reaction_time).total_seconds() < cooldown_time:
+        settings = await self.bot.guild_settings.get(payload.guild_id)
+        if settings.report_channel_id is None:
             return
 
-        self.last_reaction_time = now
-
-        if str(payload.emoji) != '⚠️':
-            self.bot.logger.warning(f"Unexpected emoji: {payload.emoji}")
+        if (now - self.last_reaction_times.get(payload.guild_id, datetime.min)).total_seconds() < cooldown_time:
             return
 
+        self.last_reaction_times[payload.guild_id] = now
+
         if payload.message_id in self.last_report_times:
             time_since_last_report = now - self.last_report_times[payload.message_id]
             if time_since_last_report.total_seconds() < report_cooldown_time:
@@ -156,14 +363,15 @@ class Support(commands.Cog):
         if not user or not channel or not original_message or user.bot:
             return
 
-        report_channel = self.bot.get_channel(report_channel_id)
+        report_channel = self.bot.get_channel(settings.report_channel_id)
         if report_channel is None:
             return
 
         jump_url = original_message.jump_url
         embed = self._create_report_embed(user)
+        ping = f"<@&{settings.report_ping_role_id}>\n" if settings.report_ping_role_id else ""
         response_message = await report_channel.send(
-            content=f"<@&PLACEHOLDER>\n[Jump to Message]({jump_url})",
+            content=f"{ping}[Jump to Message]({jump_url})",
             embed=embed,
         )
 
@@ -172,17 +380,17 @@ class Support(commands.Cog):
             message_id=payload.message_id,
             channel_id=payload.channel_id,
             response_message=response_message,
-            jump_url=jump_url
+            jump_url=jump_url,
+            settings=settings
         )
 
-        quick_delete_message = await original_message.reply(
+        await original_message.reply(
             content=f"[Jump to Message]({jump_url})",
             view=delete_button_view
         )
 
+        # The view deletes all three messages itself, so nothing waits on it here.
         self.last_report_times[payload.message_id] = now
-        await delete_button_view.wait()
-        await self._delete_messages(original_message, response_message, quick_delete_message)
 
     async def _fetch_user_channel_message(self, payload):
         try:
@@ -202,33 +410,52 @@ class Support(commands.Cog):
         )
 
     @staticmethod
-    async def _delete_messages(original_message, response_message, quick_delete_message):
-        for message in [original_message, response_message, quick_delete_message]:
-            try:
-                await message.delete()
-            except discord.errors.NotFound:
-                continue
-
-    def create_indexes(self):
-        """Create indexes for the tag collection."""
-        self.tag_collection.create_index([("name", 1)], unique=True)
+    def get_tag_query(guild_id: int, tag_name: str):
+        """Generate a MongoDB query for retrieving a guild's tag by name, ignoring case."""
+        return {"guild_id": guild_id, "name_lower": tag_name.lower()}
+
+    def search_index(self, guild_id: int):
+        return self.tag_search.setdefault(guild_id, TagSearchIndex())
+
+    async def load_tags(self):
+        """Stream every tag once to build the name table (routing, lookups) and the search indexes."""
+        names = {}
+        self.tag_search.clear()
+        async for tag in self.tag_collection.find({}, {"_id": 0, "guild_id": 1, "name": 1, "content": 1}):
+            guild_id = tag.get("guild_id")
+            names[(guild_id, tag["name"].lower())] = tag["name"]
+            self.search_index(guild_id).add(tag["name"], tag.get("content", ""))
+
+        self.tag_names.clear()
+        self.tag_names.update(names)
+        self.bot.logger.info(f"Loaded {len(self.tag_names)} tag names across {len(self.tag_search)} guilds.")
+
+    async def get_tag(self, guild_id: int, tag_name: str):
+        """Return a guild's tag document, reading through the in-memory tag cache. Unknown names cost no I/O."""
+        cache_key = (guild_id, tag_name.lower())
+        name = self.tag_names.get(cache_key)
+        if name is None:
+            return None
 
-    @staticmethod
-    def get_tag_query(tag_name: str):
-        """Generate a MongoDB query for retrieving a tag by name."""
-        escaped_tag_name = re.escape(tag_name)
-        return {"name": {"$regex": f"^{escaped_tag_name}$", "$options": "i"}}
+        tag_document = self.tag_cache.get(cache_key)
+        if tag_document is None:
+            query = {"guild_id": guild_id, "name_lower": cache_key[1]}
+            tag_document = await self.tag_collection.find_one(query, {"_id": 0})
+            if tag_document:
+                self.tag_cache.set(cache_key, tag_document)
+        return tag_document
 
     async def run_tag_command(self, message, tag_name: str, target_message_id: int = None):
         try:
-            query = self.get_tag_query(tag_name)
-            tag_document = await self.tag_collection.find_one(query)
+            guild_id = message.guild.id if message.guild else None
+            tag_document = await self.get_tag(guild_id, tag_name)
 
             if not tag_document:
                 if isinstance(message, commands.Context):
                     return await message.send(f"Tag '{tag_name}' not found.")
                 return
 
+            self.tag_usage.record(guild_id, tag_document["name"])
             tag_content = tag_document.get("content", "No content available")
             target_message_id = (
                 message.reference.message_id if getattr(message, 'reference', None) else target_message_id
@@ -254,12 +481,12 @@ class Support(commands.Cog):
         except Exception as e:
             await message.channel.send(f"An error occurred while processing the tag: {str(e)}")
 
-    @staticmethod
-    async def check_permissions(ctx):
-        support_role = discord.utils.get(ctx.author.roles, name='Support')
-        return support_role is not None
+    async def check_permissions(self, ctx):
+        settings = await self.bot.guild_settings.get(ctx.guild.id)
+        return settings.is_support(ctx.author)
 
     @commands.hybrid_group(name='tag', description='Tag commands', case_insensitive=True)
+    @commands.guild_only()
     async def tag_command(self, ctx, tag_name: str = None, *, target_message_id: int = None):
         if tag_name:
             target_message_id = (
@@ -269,31 +496,41 @@ class Support(commands.Cog):
         elif not ctx.invoked_subcommand:
             await ctx.send("Invalid tag command. Use `!help tag` for more information.")
 
-    @commands.has_any_role('Support')
+    @is_support()
     @tag_command.command(name='create', description='Create a new tag')
     async def create_tag(self, ctx, tag_name: str, *, tag_content: str):
-        query = self.get_tag_query(tag_name)
+        query = self.get_tag_query(ctx.guild.id, tag_name)
         existing_tag = await self.tag_collection.find_one(query)
 
         if existing_tag:
             return await ctx.send(f"A tag with the name '{tag_name}' already exists.")
 
-        tag_data = {"author_id": ctx.author.id, "name": tag_name, "content": tag_content}
+        tag_data = {"guild_id": ctx.guild.id, "author_id": ctx.author.id, "name": tag_name,
+                    "name_lower": tag_name.lower(), "content": tag_content}
         await self.tag_collection.update_one(query, {"$set": tag_data}, upsert=True)
+        self.tag_names[(ctx.guild.id, tag_name.lower())] = tag_name
+        self.search_index(ctx.guild.id).add(tag_name, tag_content)
         await ctx.send(f"Tag '{tag_name}' created successfully!")
 
     async def edit_or_delete_tag(self, ctx, tag_name: str, new_tag_content: str = None, delete: bool = False):
-        query = self.get_tag_query(tag_name)
+        query = self.get_tag_query(ctx.guild.id, tag_name)
         existing_tag = await self.tag_collection.find_one(query)
 
         if existing_tag:
             if await self.check_permissions(ctx):
+                key = (ctx.guild.id, existing_tag["name"].lower())
                 if delete:
                     await self.tag_collection.delete_one(query)
+                    # Invalidated after the write, so a lookup during it can't cache the old document again.
+                    self.tag_cache.pop(key)
+                    self.tag_names.pop(key, None)
+                    self.search_index(ctx.guild.id).remove(existing_tag["name"])
                     await ctx.send(f"Tag '{tag_name}' deleted successfully!")
                 else:
                     update_query = {"$set": {"content": new_tag_content}}
                     await self.tag_collection.update_one(query, update_query)
+                    self.tag_cache.pop(key)
+                    self.search_index(ctx.guild.id).add(existing_tag["name"], new_tag_content)
                     await ctx.send(f"Tag '{tag_name}' edited successfully!")
             else:
                 await ctx.send("You don't have permission to perform this action.")
@@ -302,7 +539,7 @@ class Support(commands.Cog):
 
     @tag_command.command(name='list', description='List all tags')
     async def list_tags(self, ctx):
-        all_tags = await self.tag_collection.find().to_list(length=None)
+        all_tags = await self.tag_collection.find({"guild_id": ctx.guild.id}).to_list(length=None)
 
         if not all_tags:
             return await ctx.send("No tags found.")
@@ -325,7 +562,7 @@ class Support(commands.Cog):
 
     @tag_command.command(name='all', description='List all tags in the server')
     async def list_all_tags(self, ctx):
-        all_tags = await self.tag_collection.find().to_list(length=None)
+        all_tags = await self.tag_collection.find({"guild_id": ctx.guild.id}).to_list(length=None)
 
         if not all_tags:
             return await ctx.send("No tags found.")
@@ -339,35 +576,133 @@ class Support(commands.Cog):
         embed.set_author(name="All Tags", icon_url=str(ctx.guild.icon))
         await ctx.send(embed=embed)
 
-    @commands.has_any_role('Support')
+    @is_support()
     @tag_command.command(name='edit', description='Edit an existing tag')
     async def edit_tag(self, ctx, tag_name: str, *, new_tag_content: str):
         await self.edit_or_delete_tag(ctx, tag_name, new_tag_content)
 
-    @commands.has_any_role('Support')
+    @is_support()
     @tag_command.command(name='delete', description='Delete an existing tag')
     async def delete_tag(self, ctx, tag_name: str):
         await self.edit_or_delete_tag(ctx, tag_name, delete=True)
 
-    @commands.Cog.listener()
-    async def on_message(self, message):
-        if message.author.bot:
-            return
+    @is_support()
+    @tag_command.command(name='export', description='Export every tag as a JSON or NDJSON file')
+    async def export_tag_file(self, ctx, file_format: Literal['json', 'ndjson'] = 'json'):
+        await ctx.defer()
+        export_file, count = await export_tags(self.tag_collection, ctx.guild.id, file_format)
 
-        if message.content.startswith('!'):
-            tag_name = message.content[1:].strip()
+        with export_file:
+            file = discord.File(export_file, filename=f"tags.{file_format}")
+            await ctx.send(f"Exported {count} tags.", file=file)
 
-            if tag_name:
-                try:
-                    target_message_id = message.reference.message_id if getattr(message, 'reference', None) else None
-                    await self.run_tag_command(message, tag_name, target_message_id)
-                except discord.errors.HTTPException as e:
-                    if "No matching document" in str(e):
-                        pass
-                    else:
-                        await message.channel.send(f"An error occurred while processing the tag: {str(e)}")
-                except AttributeError as attr_error:
-                    await message.channel.send(f"An error occurred while processing the tag: {str(attr_error)}")
+    @is_support()
+    @tag_command.command(name='import', description='Import tags from a JSON or NDJSON file')
+    async def import_tag_file(self, ctx, file: discord.Attachment,
+                          policy: Literal['skip', 'overwrite', 'fail'] = 'skip', ordered: bool = False):
+        await ctx.defer()
+        summary = TagImportSummary(policy, ordered)
+
+        try:
+            async with self.session.get(file.url) as response:
+                response.raise_for_status()
+                await import_tags(
+                    self.tag_collection,
+                    ctx.guild.id,
+                    response.content.iter_chunked(64 * 1024),
+                    policy=policy,
+                    ordered=ordered,
+                    batch_size=self.config.get("TAG_IMPORT_BATCH_SIZE", 500),
+                    summary=summary,
+                )
+        except TagImportError as e:
+            return await ctx.send(f"Could not import `{file.filename}`: {e}{self._written_note(summary)}")
+        except aiohttp.ClientError as e:
+            self.bot.logger.error(f"Error downloading tag import file: {e}")
+            return await ctx.send(f"Could not download the uploaded file. Please try again."
+                                  f"{self._written_note(summary)}")
+        except PyMongoError as e:
+            self.bot.logger.error(f"Error writing imported tags: {e}")
+            return await ctx.send(f"The import failed while writing tags.{self._written_note(summary)}")
+        finally:
+            # Batches are written as they fill, so whatever reached the database has to become reachable.
+            self.tag_cache.clear()
+            await self.load_tags()
+
+        embed = discord.Embed(
+            title="Tag Import",
+            description="\n".join(summary.lines()),
+            color=discord.Color.from_rgb(43, 45, 49)
+        )
+        embed.set_footer(text=f"Policy: {policy} - {'ordered' if ordered else 'unordered'} batches")
+        await ctx.send(embed=embed)
+
+    @staticmethod
+    def _written_note(summary):
+        if not summary.written:
+            return ""
+        return f"\n{summary.written} tags were written before the error and are available."
+
+    @tag_command.command(name='top', description='Show the most used tags')
+    async def top_tags(self, ctx, limit: commands.Range[int, 1, 25] = 10):
+        await self.tag_usage.flush()
+        top_tags = await self.tag_usage.top(ctx.guild.id, limit)
+
+        if not top_tags:
+            return await ctx.send("No tag usage has been recorded yet.")
+
+        lines = []
+        for position, tag in enumerate(top_tags, start=1):
+            last_used = tag.get("last_used")
+            last_used_text = format_dt(last_used.replace(tzinfo=timezone.utc), style='R') if last_used else "never"
+            lines.append(f"**{position}.** `{tag['name']}` - {tag['uses']} uses, last used {last_used_text}")
+
+        embed = discord.Embed(
+            title="Top Tags",
+            description="\n".join(lines),
+            color=discord.Color.from_rgb(43, 45, 49)
+        )
+        await ctx.send(embed=embed)
+
+    @tag_command.command(name='search', description='Search tags by name and content')
+    async def search_tags(self, ctx, *, query: str):
+        start_time = time.perf_counter()
+        tag_search = self.search_index(ctx.guild.id)
+        results = tag_search.search(query, limit=10)
+        elapsed_time = (time.perf_counter() - start_time) * 1000
+
+        if not results:
+            return await ctx.send(f"No tags match '{query}'.")
+
+        lines = []
+        for name, _ in results:
+            snippet = tag_search.snippets.get(name, "").replace("\n", " ")
+            lines.append(f"**`{name}`** - {snippet}")
+
+        embed = discord.Embed(
+            title=f"Tags matching '{query[:200]}'",
+            description="\n".join(lines),
+            color=discord.Color.from_rgb(43, 45, 49)
+        )
+        embed.set_footer(text=f"{len(results)} results from {len(tag_search)} tags in {elapsed_time:.2f}ms")
+        await ctx.send(embed=embed)
+
+    async def dispatch_tag(self, message, route):
+        """Prefix router handler for `!<tag name>` messages. Only called for names that exist."""
+        self.bot.work_queues['tags'].submit(message, route)
+
+    async def run_routed_tag(self, message, route):
+        try:
+            target_message_id = message.reference.message_id if getattr(message, 'reference', None) else None
+            _, tag_name = route.key
+            await self.run_tag_command(message, tag_name, target_message_id)
+        except discord.errors.HTTPException as e:
+            if "No matching document" in str(e):
+                pass
+            else:
+                await message.channel.send(f"An error occurred while processing the tag: {str(e)}")
+        except AttributeError as attr_error:
+            await message.channel.send(f"An error occurred while processing the tag: {str(attr_error)}")
 
 async def setup(bot_instance):
     await bot_instance.add_cog(Support(bot_instance))
@@ -2,6 +2,7 @@ import discord
 from discord.ext import commands
 import psutil
 import json
+from guild_settings import is_support
 
 
 class Utility(commands.Cog):
@@ -60,8 +61,64 @@ class Utility(commands.Cog):
         embed.add_field(name="CPU Usage", value=f"{psutil.cpu_percent()}%", inline=True)
         embed.add_field(name="Loaded Cogs", value=len(self.bot.cogs), inline=True)
 
+        database_ok = self.bot.db is not None and await self.bot.db.ping()
+        embed.add_field(name="Database", value="Connected" if database_ok else "Unavailable", inline=True)
+
+        await ctx.send(embed=embed)
+
+
+    @commands.hybrid_command(name="restbudget", with_app_command=True,
+                             description="Show Discord REST calls per command and event")
+    @is_support()
+    async def rest_budget(self, ctx, limit: commands.Range[int, 1, 25] = 15):
+        """Command to show which handlers spend the bot's shared REST rate limits."""
+        rows = self.bot.rest_budget.snapshot()[:limit]
+        if not rows:
+            return await ctx.send("No REST calls have been made yet.")
+
+        lines = [f"{'Handler':<40} {'Calls':>6} {'429s':>5} {'Wait':>8}"]
+        for handler, stats in rows:
+            lines.append(f"{handler[:40]:<40} {stats.calls:>6} {stats.rate_limited:>5} {stats.wait_seconds:>7.2f}s")
+
+        embed = discord.Embed(
+            title="REST Budget",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=discord.Color.from_rgb(43, 45, 49)
+        )
         await ctx.send(embed=embed)
 
+    @commands.hybrid_command(name="queues", with_app_command=True,
+                             description="Show event handler queue depth and drops")
+    @is_support()
+    async def queues(self, ctx):
+        """Command to show how far behind each event handler queue is."""
+        if not self.bot.work_queues:
+            return await ctx.send("No work queues are running.")
+
+        lines = [f"{'Queue':<16} {'Depth':>9} {'Active':>6} {'Done':>7} {'Dropped':>7} {'Merged':>6} {'Failed':>6}"]
+        for name, queue in sorted(self.bot.work_queues.items()):
+            stats = queue.stats()
+            depth = f"{stats['depth']}/{stats['maxsize']}"
+            lines.append(f"{name[:16]:<16} {depth:>9} {stats['active']:>6} {stats['processed']:>7} "
+                         f"{stats['dropped']:>7} {stats['coalesced']:>6} {stats['failed']:>6}")
+
+        embed = discord.Embed(
+            title="Work Queues",
+            description="```\n" + "\n".join(lines) + "\n```",
+            color=discord.Color.from_rgb(43, 45, 49)
+        )
+        await ctx.send(embed=embed)
+
+    @commands.hybrid_command(name="reload", with_app_command=True,
+                             description="Reload a cog without restarting the bot")
+    @commands.is_owner()
+    async def reload(self, ctx, extension: str):
+        """Command to hot reload an extension, keeping its caches warm."""
+        try:
+            await self.bot.reload_cog(extension, ctx=ctx)
+        except commands.ExtensionError as e:
+            return await ctx.send(f"Failed to reload `{extension}`: {e}")
+        await ctx.send(f"Reloaded `{extension}`.")
 
 async def setup(bot_instance):
     await bot_instance.add_cog(Utility(bot_instance))
@@ -0,0 +1,131 @@
+import logging
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+from pymongo.errors import PyMongoError
+
+
+class Database:
+    """Owns the bot's single pooled MongoDB client and the collections shared by cogs."""
+
+    INDEXES = {
+        "tags": [
+            IndexModel([("guild_id", ASCENDING), ("name_lower", ASCENDING)], name="guild_id_1_name_lower_1",
+                       unique=True),
+            IndexModel([("guild_id", ASCENDING), ("uses", DESCENDING)], name="guild_id_1_uses_-1"),
+            # Serves the cross-guild pre-warm query in TagUsageTracker.hot_tags.
+            IndexModel([("uses", DESCENDING)], name="uses_-1"),
+        ],
+        "threads": [
+            IndexModel([("parent_id", ASCENDING), ("archived", ASCENDING), ("last_activity", ASCENDING)],
+                       name="parent_id_1_archived_1_last_activity_1"),
+        ],
+        "sentry_errors": [
+            IndexModel([("received_at", ASCENDING)], name="received_at_ttl", expireAfterSeconds=7 * 24 * 60 * 60),
+            IndexModel([("issue.id", ASCENDING)], name="issue.id_1"),
+        ],
+    }
+
+    # Indexes from before tags were scoped by guild and matched without case. A unique index on name alone
+    # would stop two guilds from having a tag with the same name; one on the exact name lets "FAQ" and "faq"
+    # coexist in one guild.
+    LEGACY_INDEXES = {
+        "tags": ["name_1", "guild_id_1_name_1"],
+    }
+
+    def __init__(self, uri, config, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.client = AsyncIOMotorClient(
+            uri,
+            maxPoolSize=config.get("MONGO_MAX_POOL_SIZE", 10),
+            minPoolSize=config.get("MONGO_MIN_POOL_SIZE", 0),
+            maxIdleTimeMS=config.get("MONGO_MAX_IDLE_TIME_MS", 60000),
+            waitQueueTimeoutMS=config.get("MONGO_WAIT_QUEUE_TIMEOUT_MS", 5000),
+            serverSelectionTimeoutMS=config.get("MONGO_SERVER_SELECTION_TIMEOUT_MS", 5000),
+            connectTimeoutMS=config.get("MONGO_CONNECT_TIMEOUT_MS", 5000),
+            socketTimeoutMS=config.get("MONGO_SOCKET_TIMEOUT_MS", 10000),
+        )
+        self.database = self.client[config.get("MONGO_DATABASE", "Cronus")]
+        self.default_guild_id = config.get("DEFAULT_GUILD_ID")
+        self.ready = False
+
+    def collection(self, name):
+        """Return a collection on the shared client."""
+        return self.database[name]
+
+    @property
+    def tags(self):
+        return self.collection("tags")
+
+    @property
+    def threads(self):
+        return self.collection("threads")
+
+    @property
+    def sentry_errors(self):
+        return self.collection("sentry_errors")
+
+    @property
+    def guild_settings(self):
+        return self.collection("guild_settings")
+
+    async def ping(self):
+        """Return True if the deployment answers a ping."""
+        try:
+            await self.client.admin.command("ping")
+            return True
+        except PyMongoError as e:
+            self.logger.error(f"MongoDB ping failed: {e}")
+            return False
+
+    async def migrate(self):
+        """Bring tags stored by older versions up to date: default guild, lowercase name, current indexes."""
+        if self.default_guild_id is not None:
+            result = await self.tags.update_many({"guild_id": {"$exists": False}},
+                                                 {"$set": {"guild_id": self.default_guild_id}})
+            if result.modified_count:
+                self.logger.info(f"Assigned {result.modified_count} tags to guild {self.default_guild_id}.")
+
+        # Lowercased in Python rather than with $toLower, which is only defined for ASCII.
+        operations = [
+            UpdateOne({"_id": tag["_id"]}, {"$set": {"name_lower": tag["name"].lower()}})
+            async for tag in self.tags.find({"name_lower": {"$exists": False}}, {"name": 1})
+        ]
+        if operations:
+            await self.tags.bulk_write(operations, ordered=False)
+            self.logger.info(f"Stored lowercase names for {len(operations)} tags.")
+
+        for collection_name, index_names in self.LEGACY_INDEXES.items():
+            collection = self.collection(collection_name)
+            existing = await collection.index_information()
+            for index_name in index_names:
+                if index_name in existing:
+                    await collection.drop_index(index_name)
+                    self.logger.info(f"Dropped legacy index '{index_name}' on '{collection_name}'.")
+
+    async def ensure_indexes(self):
+        """Create every declared index and verify that it exists afterwards."""
+        for collection_name, indexes in self.INDEXES.items():
+            collection = self.collection(collection_name)
+            await collection.create_indexes(indexes)
+
+            existing = await collection.index_information()
+            missing = [index.document["name"] for index in indexes if index.document["name"] not in existing]
+            if missing:
+                raise RuntimeError(f"Indexes {missing} are missing on collection '{collection_name}'.")
+
+            self.logger.info(f"Indexes verified on '{collection_name}': {sorted(existing)}")
+
+    async def connect(self):
+        """Ping the deployment, migrate legacy data and build indexes. Raises if any step fails."""
+        if not await self.ping():
+            raise ConnectionError("Could not reach MongoDB.")
+
+        await self.migrate()
+        await self.ensure_indexes()
+        self.ready = True
+        self.logger.info("Database connected.")
+
+    def close(self):
+        """Close the client and release every pooled connection."""
+        self.client.close()
+        self.ready = False
@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import logging
+import discord
+from discord.ext import commands
+from cache import LRUCache
+
+DEFAULT_DEADLINE = 2.5
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineContext(commands.Context):
+    """A context whose first interaction response is serialized with the auto-defer timer.
+
+    While a deadline is armed, ``send`` and ``defer`` take ``response_lock`` until the interaction has been
+    answered, so the command's own reply and the timer's defer can never both try to be the first response.
+    """
+    response_lock = None
+
+    def _racing_deadline(self):
+        return self.response_lock is not None and not self.interaction.response.is_done()
+
+    async def send(self, *args, **kwargs):
+        if not self._racing_deadline():
+            return await super().send(*args, **kwargs)
+        async with self.response_lock:
+            return await super().send(*args, **kwargs)
+
+    async def defer(self, *, ephemeral=False):
+        if not self._racing_deadline():
+            return await super().defer(ephemeral=ephemeral)
+        async with self.response_lock:
+            if not self.interaction.response.is_done():
+                await super().defer(ephemeral=ephemeral)
+
+
+async def _defer_now(ctx, ephemeral):
+    async with ctx.response_lock:
+        if ctx.interaction.response.is_done():
+            return
+        await ctx.interaction.response.defer(ephemeral=ephemeral)
+        logger.info(f"Auto-deferred /{ctx.command.qualified_name}.")
+
+
+async def _defer_after(ctx, seconds, ephemeral):
+    await asyncio.sleep(seconds)
+    try:
+        # Shielded so that the command finishing mid-request can't release the lock before the defer lands.
+        await asyncio.shield(_defer_now(ctx, ephemeral))
+    except (discord.InteractionResponded, discord.HTTPException) as e:
+        logger.debug(f"Auto-defer of /{ctx.command.qualified_name} skipped: {e}")
+
+
+def arm_deadline(ctx, seconds=None, ephemeral=False):
+    """Defer ``ctx``'s interaction if the command has not responded within ``seconds``.
+
+    Does nothing for prefix invocations, which have no response deadline, or for contexts that are not a
+    ``DeadlineContext`` and so could not keep their own reply from racing the defer.
+    """
+    if ctx.interaction is None or not isinstance(ctx, DeadlineContext):
+        return
+    if seconds is None:
+        seconds = ctx.bot.config.get("COMMAND_DEADLINE_SECONDS", DEFAULT_DEADLINE)
+    ctx.response_lock = asyncio.Lock()
+    ctx.deadline_timer = asyncio.create_task(_defer_after(ctx, seconds, ephemeral))
+
+
+def disarm_deadline(ctx):
+    """Cancel the timer started by ``arm_deadline``, if any."""
+    timer = getattr(ctx, "deadline_timer", None)
+    if timer is not None:
+        timer.cancel()
+
+
+def auto_defer(seconds=None, ephemeral=False):
+    """Decorator form of ``arm_deadline`` for a single command callback."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, ctx, *args, **kwargs):
+            arm_deadline(ctx, seconds, ephemeral)
+            try:
+                return await func(self, ctx, *args, **kwargs)
+            finally:
+                disarm_deadline(ctx)
+        return wrapper
+    return decorator
+
+
+class StaleWhileRevalidate:
+    """Caches the last good result per key and serves it when a refresh misses the deadline.
+
+    Every call starts (or joins) a refresh. If it finishes within ``deadline`` seconds its result is returned,
+    otherwise the last good value is returned immediately and the refresh keeps running in the background
+    to update the cache. A fetch that raises never replaces a good value.
+    """
+
+    def __init__(self, deadline=DEFAULT_DEADLINE, maxsize=128):
+        self.deadline = deadline
+        self.entries = LRUCache(maxsize)
+        self.refreshing = {}
+
+    def _store(self, key, task):
+        self.refreshing.pop(key, None)
+        if task.cancelled():
+            return
+        if task.exception() is None:
+            self.entries.set(key, task.result())
+
+    def _refresh(self, key, fetch):
+        task = self.refreshing.get(key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self.refreshing[key] = task
+            task.add_done_callback(functools.partial(self._store, key))
+        return task
+
+    def export(self):
+        """Return the cached good values, least recently used first."""
+        return self.entries.items()
+
+    def load(self, items):
+        """Restore values returned by ``export``."""
+        for key, value in items:
+            self.entries.set(key, value)
+
+    async def get(self, key, fetch):
+        """Return a fresh value if ``fetch`` is fast enough, otherwise the last good one."""
+        task = self._refresh(key, fetch)
+        if key not in self.entries:
+            return await asyncio.shield(task)
+
+        done, _ = await asyncio.wait({task}, timeout=self.deadline)
+        if done and not task.cancelled() and task.exception() is None:
+            return task.result()
+        return self.entries.get(key)
@@ -0,0 +1,99 @@
+import logging
+from discord.ext import commands
+from cache import LRUCache
+
+SETTING_FIELDS = (
+    "support_role_id",
+    "support_role_name",
+    "report_channel_id",
+    "report_ping_role_id",
+    "delete_role_id",
+    "support_forum_id",
+)
+
+
+class GuildSettings:
+    """One guild's configuration. A feature whose channel or role is unset is off in that guild."""
+    __slots__ = ("guild_id",) + SETTING_FIELDS
+
+    def __init__(self, guild_id, support_role_id=None, support_role_name="Support", report_channel_id=None,
+                 report_ping_role_id=None, delete_role_id=None, support_forum_id=None):
+        self.guild_id = guild_id
+        self.support_role_id = support_role_id
+        self.support_role_name = support_role_name
+        self.report_channel_id = report_channel_id
+        self.report_ping_role_id = report_ping_role_id
+        self.delete_role_id = delete_role_id
+        self.support_forum_id = support_forum_id
+
+    @classmethod
+    def from_document(cls, guild_id, document):
+        return cls(guild_id, **{field: document[field] for field in SETTING_FIELDS if field in (document or {})})
+
+    def is_support(self, member):
+        """Support staff hold the configured support role, or a role named ``support_role_name`` if none is set."""
+        roles = getattr(member, "roles", [])
+        if self.support_role_id is not None:
+            return any(role.id == self.support_role_id for role in roles)
+        return any(role.name == self.support_role_name for role in roles)
+
+    def can_quick_delete(self, member):
+        if self.delete_role_id is not None:
+            return any(role.id == self.delete_role_id for role in getattr(member, "roles", []))
+        return self.is_support(member)
+
+
+class GuildSettingsStore:
+    """Per-guild settings stored in Mongo and served from an LRU cache.
+
+    Every read after the first one for a guild is a cache hit; writes through this store invalidate the entry.
+    """
+
+    def __init__(self, collection, maxsize=1024, logger=None):
+        self.collection = collection
+        self.cache = LRUCache(maxsize)
+        self.logger = logger or logging.getLogger(__name__)
+
+    async def get(self, guild_id):
+        settings = self.cache.get(guild_id)
+        if settings is None:
+            document = await self.collection.find_one({"_id": guild_id})
+            settings = GuildSettings.from_document(guild_id, document)
+            self.cache.set(guild_id, settings)
+        return settings
+
+    async def update(self, guild_id, **fields):
+        unknown = set(fields) - set(SETTING_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown settings: {', '.join(sorted(unknown))}")
+
+        await self.collection.update_one({"_id": guild_id}, {"$set": fields}, upsert=True)
+        self.cache.pop(guild_id)
+
+    async def seed(self, guild_id, fields):
+        """Create a guild's settings from ``fields`` unless it already has some."""
+        await self.collection.update_one({"_id": guild_id}, {"$setOnInsert": fields}, upsert=True)
+        self.cache.pop(guild_id)
+
+    async def guilds_with(self, field):
+        """Return the settings of every guild that has ``field`` set, caching them on the way."""
+        guilds = []
+        async for document in self.collection.find({field: {"$ne": None}}):
+            settings = GuildSettings.from_document(document["_id"], document)
+            self.cache.set(settings.guild_id, settings)
+            guilds.append(settings)
+        return guilds
+
+
+def is_support():
+    """A check that passes for members of the guild's support team."""
+    async def predicate(ctx):
+        if ctx.guild is None:
+            raise commands.NoPrivateMessage()
+
+        settings = await ctx.bot.guild_settings.get(ctx.guild.id)
+        if settings.is_support(ctx.author):
+            return True
+        raise commands.MissingAnyRole([settings.support_role_id or settings.support_role_name])
+
+    return commands.check(predicate)
@@ -0,0 +1,76 @@
+import ast
+from discord import app_commands, InteractionType
+from discord.ext import commands
+
+COMMAND_DECORATORS = {"command", "hybrid_command", "group", "hybrid_group"}
+
+
+class ExtensionStub:
+    """What is known about an extension without importing it: its cog, top-level commands and listeners."""
+
+    def __init__(self, name, cog_name, command_names, has_listeners):
+        self.name = name
+        self.cog_name = cog_name
+        self.command_names = command_names
+        self.has_listeners = has_listeners
+
+
+def _decorator_name(decorator):
+    target = decorator.func if isinstance(decorator, ast.Call) else decorator
+    return target.attr if isinstance(target, ast.Attribute) else getattr(target, "id", None)
+
+
+def _constant_keyword(call, keyword_name):
+    for keyword in call.keywords:
+        if keyword.arg == keyword_name:
+            return ast.literal_eval(keyword.value)
+    return None
+
+
+def scan_extension(name, path):
+    """Parse an extension's source and describe it without executing any of it."""
+    with open(path, "r", encoding="utf-8") as source_file:
+        tree = ast.parse(source_file.read(), filename=path)
+
+    cog_name, command_names, has_listeners = None, set(), False
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(_decorator_name(base) == "Cog" for base in node.bases):
+            continue
+
+        cog_name = cog_name or node.name
+        for member in node.body:
+            if not isinstance(member, ast.AsyncFunctionDef):
+                continue
+            for decorator in member.decorator_list:
+                decorator_name = _decorator_name(decorator)
+                if decorator_name == "listener":
+                    has_listeners = True
+                elif decorator_name in COMMAND_DECORATORS and isinstance(decorator, ast.Call) and \
+                        isinstance(decorator.func, ast.Attribute) and \
+                        getattr(decorator.func.value, "id", None) == "commands":
+                    command_names.add(_constant_keyword(decorator, "name") or member.name)
+                    command_names.update(_constant_keyword(decorator, "aliases") or ())
+
+    return ExtensionStub(name, cog_name, command_names, has_listeners)
+
+
+class LazyCommandTree(app_commands.CommandTree):
+    """Loads a lazy extension before the tree looks up the slash command that needs it."""
+
+    async def interaction_check(self, interaction):
+        if interaction.type not in (InteractionType.application_command, InteractionType.autocomplete):
+            return True
+
+        command_name = interaction.data.get("name")
+        try:
+            await self.client.ensure_extension_for(command_name)
+        except commands.ExtensionError as e:
+            self.client.logger.error(f"Failed to load the extension for /{command_name}: {e}")
+            if interaction.type is InteractionType.application_command:
+                await interaction.response.send_message(
+                    "This command is unavailable right now, please try again later.", ephemeral=True
+                )
+            return False
+        return True
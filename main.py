@@ -7,6 +7,14 @@ import asyncio
 import aiohttp
 import time
 import json
+from collections import Counter
+from database import Database
+from guild_settings import GuildSettingsStore
+from rest_budget import RestBudget
+from lazy_extensions import LazyCommandTree, scan_extension
+from router import PrefixRouter
+from deadline import DeadlineContext
+from work_queue import WorkQueue
 
 
 load_dotenv()
@@ -14,6 +22,7 @@ load_dotenv()
 
 class Config:
     TOKEN = os.getenv("TOKEN")
+    MONGO_URI = os.getenv("MONGO_URI")
 
 
 def load_config():
@@ -26,16 +35,44 @@ CONFIG_PATH = 'config.json'
 COGS_PATH = 'Cogs'
 
 
+class CogReloading(commands.CheckFailure):
+    """Raised when a command belongs to a cog that is being reloaded."""
+
+
 class Bot(commands.AutoShardedBot):
     def __init__(self, *args, **kwargs):
         """Initializes the bot."""
+        rest_budget = RestBudget()
+        kwargs.setdefault('http_trace', rest_budget.trace_config())
         super().__init__(*args, **kwargs)
+        self.rest_budget = rest_budget
+        self.http.request = rest_budget.wrap_request(self.http.request)
         self.commands_cache = {}
         self.logger = self.setup_logger()
         self.session = None
+        self.db = None
+        self.guild_settings = None
         self.is_ready = asyncio.Event()
+        self.in_flight = Counter()
+        self.reloading = set()
+        self.cog_state = {}
+        self.lazy_extensions = {}
+        self.lazy_cogs = {}
+        self.extension_load_times = {}
+        self._extension_locks = {}
+        self._prewarm_task = None
+        self.last_command_at = time.monotonic()
+        self.work_queues = {}
+        self.router = PrefixRouter(BOT_PREFIX)
+        self.router.register('command', self.all_commands, self.dispatch_command)
+        self.router.register('lazy', self.lazy_extensions, self.dispatch_lazy_command)
         self.logger.info("Bot class instantiated.")
         self.config = self.load_config()
+        self.add_check(self.check_not_reloading)
+        self.before_invoke(self.track_command_start)
+        self.after_invoke(self.track_command_end)
+        # Slash invocations of hybrid commands skip after-invoke hooks when the callback raises.
+        self.add_listener(self.track_command_end, 'on_command_error')
 
     def load_config(self):
         """Load the bot's configuration from a JSON file."""
@@ -59,6 +96,124 @@ class Bot(commands.AutoShardedBot):
         logger.setLevel(logging.INFO)
         return logger
 
+    async def setup_hook(self):
+        """Connects the shared database and guild settings before any extension is loaded."""
+        self.db = Database(Config.MONGO_URI, self.config, logger=self.logger)
+        try:
+            await self.db.connect()
+        except Exception as e:
+            self.logger.error(f"Failed to connect to the database: {e}")
+            raise
+
+        self.guild_settings = GuildSettingsStore(self.db.guild_settings,
+                                                 maxsize=self.config.get("GUILD_SETTINGS_CACHE_SIZE", 1024),
+                                                 logger=self.logger)
+        default_guild_id = self.config.get("DEFAULT_GUILD_ID")
+        if default_guild_id is not None:
+            await self.guild_settings.seed(default_guild_id, self.config.get("DEFAULT_GUILD_SETTINGS", {}))
+
+    async def _run_event(self, coro, event_name, *args, **kwargs):
+        """Attributes REST calls made by an event handler to that handler."""
+        owner = getattr(coro, '__self__', None)
+        owner_name = owner.qualified_name if isinstance(owner, commands.Cog) else type(self).__name__
+        self.rest_budget.attribute(f"event:{owner_name}.{event_name}")
+
+        if not isinstance(owner, commands.Cog):
+            return await super()._run_event(coro, event_name, *args, **kwargs)
+
+        self.in_flight[owner.qualified_name] += 1
+        try:
+            await super()._run_event(coro, event_name, *args, **kwargs)
+        finally:
+            self.in_flight[owner.qualified_name] -= 1
+
+    async def get_context(self, origin, /, *, cls=discord.utils.MISSING):
+        """Builds a DeadlineContext and attributes REST calls made while invoking a command to that command."""
+        if cls is discord.utils.MISSING:
+            cls = DeadlineContext
+        ctx = await super().get_context(origin, cls=cls)
+        if ctx.command is not None:
+            self.rest_budget.attribute(f"command:{ctx.command.qualified_name}")
+        return ctx
+
+    async def check_not_reloading(self, ctx):
+        """Global check that holds off new commands for a cog while it is being reloaded."""
+        if ctx.cog is not None and ctx.cog.qualified_name in self.reloading:
+            raise CogReloading(f"{ctx.cog.qualified_name} is being updated, please try again in a moment.")
+        return True
+
+    async def track_command_start(self, ctx):
+        self.last_command_at = time.monotonic()
+        if ctx.cog is not None:
+            self.in_flight[ctx.cog.qualified_name] += 1
+            ctx.in_flight_cog = ctx.cog.qualified_name
+
+    async def track_command_end(self, ctx, _error=None):
+        """Runs as the after-invoke hook and on command errors; only the first call for an invocation counts."""
+        cog_name = getattr(ctx, 'in_flight_cog', None)
+        if cog_name is not None:
+            ctx.in_flight_cog = None
+            self.in_flight[cog_name] -= 1
+
+    async def drain_cog(self, cog_name, timeout, ignore=0):
+        """Wait until a cog has no commands or listeners running. Returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.in_flight[cog_name] > ignore:
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    def create_work_queue(self, name, handler, **defaults):
+        """Start a bounded work queue for an event handler. ``WORK_QUEUES[name]`` in the config overrides defaults."""
+        options = {**defaults, **self.config.get("WORK_QUEUES", {}).get(name, {})}
+        queue = WorkQueue(name, handler, logger=self.logger, **options)
+        self.work_queues[name] = queue
+        queue.start()
+        return queue
+
+    async def close_work_queue(self, name):
+        queue = self.work_queues.pop(name, None)
+        if queue is not None:
+            await queue.close(self.config.get("WORK_QUEUE_DRAIN_SECONDS", 5))
+
+    def take_cog_state(self, cog_name):
+        """Return (and forget) the warm state handed off by the previous instance of a cog."""
+        return self.cog_state.pop(cog_name, None)
+
+    async def reload_cog(self, extension, ctx=None):
+        """Reloads an extension in place, handing each cog's warm state to its new instance.
+
+        New commands for the extension's cogs are rejected while in-flight ones drain. Cogs opt in to the
+        handoff by defining ``export_state()`` and reading ``take_cog_state()`` in ``cog_load``.
+        """
+        name = extension if '.' in extension or extension == 'jishaku' else f'{COGS_PATH}.{extension}'
+        if name not in self.extensions and name in self.lazy_extensions.values():
+            return await self.ensure_extension(name)
+
+        cogs = [cog for cog in self.cogs.values() if cog.__module__ == name]
+        cog_names = {cog.qualified_name for cog in cogs}
+        timeout = self.config.get("RELOAD_DRAIN_TIMEOUT_SECONDS", 30)
+
+        self.reloading.update(cog_names)
+        try:
+            for cog in cogs:
+                own_invocation = 1 if ctx is not None and ctx.cog is cog else 0
+                if not await self.drain_cog(cog.qualified_name, timeout, ignore=own_invocation):
+                    self.logger.warning(f"{cog.qualified_name} still has work in flight after {timeout}s, "
+                                        f"reloading anyway.")
+                if hasattr(cog, 'export_state'):
+                    self.cog_state[cog.qualified_name] = cog.export_state()
+
+            start_time = time.perf_counter()
+            await self.reload_extension(name)
+            elapsed_time = (time.perf_counter() - start_time) * 1000
+            self.logger.info(f"Reloaded {name} in {elapsed_time:.2f}ms.")
+        finally:
+            self.reloading.difference_update(cog_names)
+            for cog_name in cog_names:
+                self.cog_state.pop(cog_name, None)
+
     async def on_ready(self):
         """Called when the bot is ready."""
         start_time = time.time()
@@ -75,19 +230,108 @@ class Bot(commands.AutoShardedBot):
         self.is_ready.set()
 
     async def load_extensions(self):
-        """Loads all extensions."""
+        """Loads all extensions, or registers stubs for them when LAZY_EXTENSIONS is enabled."""
         self.logger.debug("Loading extensions...")
         extensions = [filename[:-3] for filename in os.listdir(COGS_PATH) if filename.endswith('.py')]
         self.logger.info(f"Found extensions: {extensions}")
 
-        tasks = [self.load_extension(f'{COGS_PATH}.{extension}') for extension in extensions]
-
+        names = [f'{COGS_PATH}.{extension}' for extension in extensions] + ['jishaku']
+        names = [name for name in names if name not in self.extensions]
+
+        if self.config.get("LAZY_EXTENSIONS", False):
+            names = self.register_lazy_extensions(names)
+
+        for name in names:
+            try:
+                await self.load_timed_extension(name)
+            except commands.ExtensionError as e:
+                self.logger.error(f"Failed to load extension {name}: {e}")
+
+        prewarm_running = self._prewarm_task is not None and not self._prewarm_task.done()
+        if self.lazy_extensions and self.config.get("LAZY_PREWARM_SECONDS") is not None and not prewarm_running:
+            self._prewarm_task = asyncio.create_task(self.prewarm_extensions(self.config["LAZY_PREWARM_SECONDS"]))
+
+    def register_lazy_extensions(self, names):
+        """Registers command stubs for extensions that can load on first use. Returns the ones that can't."""
+        eager = []
+        for name in names:
+            if name == 'jishaku':
+                self.lazy_extensions.update({'jishaku': name, 'jsk': name})
+                continue
+
+            stub = scan_extension(name, f"{name.replace('.', os.sep)}.py")
+            if stub.has_listeners or not stub.command_names:
+                # Listeners have to see events from the start, so these can't wait for a command.
+                eager.append(name)
+                continue
+            for command_name in stub.command_names:
+                self.lazy_extensions[command_name] = name
+            self.lazy_cogs[name] = stub.cog_name
+
+        self.logger.info(f"Lazy extensions: {sorted(set(self.lazy_extensions.values()))}")
+        return eager
+
+    async def load_timed_extension(self, name):
+        """Loads one extension and records how long its import and setup took."""
+        start_time = time.perf_counter()
+        await self.load_extension(name)
+        elapsed_time = (time.perf_counter() - start_time) * 1000
+        self.extension_load_times[name] = elapsed_time
+        self.logger.info(f"Loaded {name} in {elapsed_time:.2f}ms.")
+
+    async def ensure_extension(self, name):
+        """Loads a lazy extension if it has not been loaded yet. Raises ExtensionError if loading fails.
+
+        The stubs stay registered until the load succeeds, so a failed load is retried on the next use.
+        """
+        lock = self._extension_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            if name in self.extensions:
+                return
+            await self.load_timed_extension(name)
+            for command_name in [key for key, value in self.lazy_extensions.items() if value == name]:
+                del self.lazy_extensions[command_name]
+
+    async def ensure_extension_for(self, command_name):
+        """Loads the lazy extension that provides ``command_name``, if any."""
+        name = self.lazy_extensions.get(command_name)
+        if name is not None:
+            await self.ensure_extension(name)
+
+    async def prewarm_extensions(self, delay):
+        """Loads the remaining lazy extensions once no command has been invoked for ``delay`` seconds."""
+        while (idle := time.monotonic() - self.last_command_at) < delay:
+            await asyncio.sleep(delay - idle)
+        for name in sorted(set(self.lazy_extensions.values())):
+            try:
+                await self.ensure_extension(name)
+            except commands.ExtensionError as e:
+                self.logger.error(f"Failed to pre-warm extension {name}: {e}")
+        self.logger.info("Lazy extensions pre-warmed.")
+
+    async def process_commands(self, message):
+        """Routes a prefixed message to exactly one handler: a command, a lazy command or a tag.
+
+        Messages that match nothing are dropped here without any I/O.
+        """
+        if message.author.bot:
+            return
+
+        route = self.router.resolve(message.content, message.guild.id if message.guild else None)
+        if route is not None:
+            await route.handler(message, route)
+
+    async def dispatch_command(self, message, _route):
+        ctx = await self.get_context(message)
+        await self.invoke(ctx)
+
+    async def dispatch_lazy_command(self, message, route):
         try:
-            tasks.append(self.load_extension('jishaku'))
+            await self.ensure_extension_for(route.key)
         except commands.ExtensionError as e:
-            self.logger.error(f"Failed to load jishaku extension: {e}")
-
-        await asyncio.gather(*tasks, return_exceptions=True)
+            self.logger.error(f"Failed to load the extension for {route.key}: {e}")
+            return await message.reply("This command is unavailable right now, please try again later.")
+        await self.dispatch_command(message, route)
 
     async def cache_commands(self):
         """Caches all commands and their descriptions. This is used for the help command."""
@@ -102,13 +346,17 @@ class Bot(commands.AutoShardedBot):
         commands_by_cog = {}
         for command in app_commands:
             cmd = self.get_command(command['name'])
-            cog_name = cmd.cog_name if cmd else 'No Cog'
+            cog_name = cmd.cog_name if cmd else self.lazy_cog_name(command['name'])
             command_description = f"</{command['name']}:{command['id']}> - {command['description']}"
             commands_by_cog.setdefault(cog_name, []).append(command_description)
 
         self.commands_cache = commands_by_cog
         self.logger.info(f"Commands cached: {commands_by_cog}")
 
+    def lazy_cog_name(self, command_name):
+        """Returns the cog name of a command whose extension has not been loaded yet."""
+        return self.lazy_cogs.get(self.lazy_extensions.get(command_name), 'No Cog')
+
     async def set_presence(self):
         """Sets the bot's presence."""
         await self.wait_until_ready()
@@ -116,16 +364,25 @@ class Bot(commands.AutoShardedBot):
         self.logger.info("Presence was set.")
 
     async def close(self):
-        """Closes the aiohttp.ClientSession."""
+        """Closes the aiohttp.ClientSession and the database client, and drains work queues no cog closed."""
+        if self._prewarm_task:
+            self._prewarm_task.cancel()
         if self.session:
             await self.session.close()
+        # Unloading the cogs closes their own queues; only ones left without an owner are drained here.
         await super().close()
+        for name in list(self.work_queues):
+            await self.close_work_queue(name)
+        # Last, so cog_unload can still flush buffered writes.
+        if self.db:
+            self.db.close()
 
 
 intents = discord.Intents.default()
 intents.message_content = True
 
-bot = Bot(command_prefix=BOT_PREFIX, intents=intents, help_command=None, chunk_guilds_at_startup=False)
+bot = Bot(command_prefix=BOT_PREFIX, intents=intents, help_command=None, chunk_guilds_at_startup=False,
+          tree_cls=LazyCommandTree)
 
 
 @bot.event
@@ -147,6 +404,10 @@ async def on_command_error(ctx, error):
         await ctx.reply(f"This command is on cooldown, you can try again in {error.retry_after:.2f} seconds.")
         return
 
+    if isinstance(error, CogReloading):
+        await ctx.reply(str(error))
+        return
+
     if isinstance(error, commands.MissingPermissions):
         await ctx.reply("You don't have the permissions to run this command. 😔 RIP")
         return
@@ -1,9 +1,18 @@
 import discord
 from discord.ui import View
 import asyncio
+from rest_budget import RestBudget
 
 
-class TagListPaginator(View):
+class TrackedView(View):
+    """A view whose component callbacks are attributed in the bot's REST budget."""
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        RestBudget.attribute(f"view:{type(self).__name__}")
+        return True
+
+
+class TagListPaginator(TrackedView):
     def __init__(self, bot, pages):
         super().__init__()
         self.ctx = None
@@ -52,13 +61,13 @@ class TagListPaginator(View):
         return self
 
 
-class DeleteButton(discord.ui.View):
-    """A view that allows users to delete messages."""
-    allowed_role_id = 988055417907200010
+class DeleteButton(TrackedView):
+    """A view that allows users to delete messages. Who may delete comes from the guild's settings."""
 
-    def __init__(self, bot_instance, message_id, channel_id, response_message, jump_url, *, timeout=None):
+    def __init__(self, bot_instance, message_id, channel_id, response_message, jump_url, settings, *, timeout=None):
         super().__init__(timeout=timeout)
         self.bot = bot_instance
+        self.settings = settings
         self.message_id = message_id
         self.channel_id = channel_id
         self.response_message = response_message
@@ -74,7 +83,7 @@ class DeleteButton(discord.ui.View):
                 channel.fetch_message(self.message_id),
             )
 
-            if self.allowed_role_id in [role.id for role in member.roles]:
+            if self.settings.can_quick_delete(member):
                 deletion_tasks = [
                     self.response_message.delete(),
                     message.delete(),
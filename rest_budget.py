@@ -0,0 +1,121 @@
+import contextlib
+import contextvars
+import functools
+import time
+import aiohttp
+
+UNATTRIBUTED = "unattributed"
+
+current_handler = contextvars.ContextVar("current_handler", default=UNATTRIBUTED)
+_current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class HandlerStats:
+    """REST usage attributed to one command, event or view."""
+    __slots__ = ("calls", "requests", "rate_limited", "wait_seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.requests = 0
+        self.rate_limited = 0
+        self.wait_seconds = 0.0
+
+
+class RestBudget:
+    """Attributes every Discord HTTP call and rate-limit wait to the handler that caused it.
+
+    ``calls`` counts HTTP attempts on the wire (including retries and interaction responses), ``requests``
+    counts logical ``HTTPClient.request`` calls, ``rate_limited`` counts 429 responses and ``wait_seconds`` is
+    the time spent inside ``HTTPClient.request`` that was not spent on the wire, i.e. waiting on buckets.
+    """
+
+    def __init__(self):
+        self.stats = {}
+
+    def _stats(self, handler=None):
+        handler = handler or current_handler.get()
+        stats = self.stats.get(handler)
+        if stats is None:
+            stats = self.stats[handler] = HandlerStats()
+        return stats
+
+    @staticmethod
+    def attribute(handler):
+        """Attribute REST calls made for the rest of the current task to ``handler``."""
+        current_handler.set(handler)
+
+    @staticmethod
+    @contextlib.contextmanager
+    def attributed(handler):
+        """Attribute REST calls made inside the block to ``handler``."""
+        token = current_handler.set(handler)
+        try:
+            yield
+        finally:
+            current_handler.reset(token)
+
+    def trace_config(self):
+        """Return an aiohttp trace config to pass to the client as ``http_trace``."""
+        trace = aiohttp.TraceConfig()
+        trace.on_request_start.append(self._on_request_start)
+        trace.on_request_end.append(self._on_request_end)
+        trace.on_request_exception.append(self._on_request_exception)
+        return trace
+
+    async def _on_request_start(self, _session, context, _params):
+        context.started = time.perf_counter()
+        self._stats().calls += 1
+
+    def _record_wire_time(self, context):
+        record = _current_request.get()
+        if record is not None:
+            record[0] += time.perf_counter() - context.started
+
+    async def _on_request_end(self, _session, context, params):
+        self._record_wire_time(context)
+        if params.response.status == 429:
+            self._stats().rate_limited += 1
+
+    async def _on_request_exception(self, _session, context, _params):
+        self._record_wire_time(context)
+
+    def wrap_request(self, request):
+        """Wrap ``HTTPClient.request`` so time spent waiting on rate-limit buckets is measured."""
+        @functools.wraps(request)
+        async def wrapper(route, **kwargs):
+            record = [0.0]
+            token = _current_request.set(record)
+            started = time.perf_counter()
+            try:
+                return await request(route, **kwargs)
+            finally:
+                _current_request.reset(token)
+                stats = self._stats()
+                stats.requests += 1
+                stats.wait_seconds += max(0.0, time.perf_counter() - started - record[0])
+        return wrapper
+
+    def snapshot(self):
+        """Return ``(handler, stats)`` pairs, busiest handler first."""
+        return sorted(self.stats.items(), key=lambda item: item[1].calls, reverse=True)
+
+    def reset(self):
+        self.stats.clear()
+
+    @contextlib.contextmanager
+    def expect(self, handler, max_calls):
+        """Fail with AssertionError if ``handler`` makes more than ``max_calls`` REST requests inside the block.
+
+        Requests are counted at ``HTTPClient.request``, so this also works against a stubbed client. Intended for
+        tests; listeners that hand work to a queue must wait for it inside the block::
+
+            with bot.rest_budget.expect("event:Support.on_raw_reaction_add", max_calls=6):
+                await cog.on_raw_reaction_add(payload)
+                await bot.work_queues['reports'].join()
+        """
+        before = self._stats(handler).requests
+        with self.attributed(handler):
+            yield
+        used = self._stats(handler).requests - before
+        if used > max_calls:
+            raise AssertionError(f"{handler} made {used} REST calls, its budget is {max_calls}.")
@@ -0,0 +1,50 @@
+class Route:
+    """A resolved prefixed message: which table matched, on which key, and the handler to run."""
+    __slots__ = ("namespace", "key", "handler")
+
+    def __init__(self, namespace, key, handler):
+        self.namespace = namespace
+        self.key = key
+        self.handler = handler
+
+
+class PrefixRouter:
+    """Resolves every prefixed message to at most one handler after tokenizing it once.
+
+    Each table is a live mapping owned by whoever registered it (the bot's commands, lazy extension stubs,
+    tag names), so lookups stay O(1) dict hits and nothing is copied when a table changes. Tables are tried
+    in registration order. ``match="token"`` tables are keyed by the first word after the prefix (commands),
+    ``match="remainder"`` tables by the whole lowercased remainder (tags). ``scoped`` tables are keyed by
+    ``(scope, key)`` so per-guild entries share one dict.
+    """
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+        self.tables = []
+
+    def register(self, namespace, keys, handler, match="token", scoped=False):
+        self.unregister(namespace)
+        self.tables.append((namespace, keys, handler, match, scoped))
+
+    def unregister(self, namespace):
+        self.tables = [table for table in self.tables if table[0] != namespace]
+
+    def resolve(self, content, scope=None):
+        """Return the Route for ``content`` in ``scope`` (a guild ID), or None without doing any I/O."""
+        if not content.startswith(self.prefix):
+            return None
+
+        remainder = content[len(self.prefix):]
+        lowered = remainder.strip().lower()
+        if not lowered:
+            return None
+
+        # Like the commands framework, a command name has to follow the prefix directly.
+        token = None if remainder[0].isspace() else remainder.split(maxsplit=1)[0]
+        for namespace, keys, handler, match, scoped in self.tables:
+            key = token if match == "token" else lowered
+            if key is not None and scoped:
+                key = (scope, key)
+            if key is not None and key in keys:
+                return Route(namespace, key, handler)
+        return None
@@ -0,0 +1,126 @@
+import hashlib
+import hmac
+import json
+import logging
+from datetime import datetime, timezone
+from aiohttp import web
+
+SIGNATURE_HEADER = "Sentry-Hook-Signature"
+RESOURCE_HEADER = "Sentry-Hook-Resource"
+
+
+def sign_payload(secret, body):
+    """Return the signature Sentry sends for ``body``. Useful for posting test payloads to a local server."""
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+class SentryErrorIndex:
+    """Maps error IDs to Sentry issues, fed by webhooks, so /sentry rarely has to poll the search API.
+
+    Documents are keyed by error ID and expire through a TTL index on ``received_at``. Each one stores the
+    issue in the same shape the Sentry issues API returns, so callers can treat both sources alike.
+    """
+
+    def __init__(self, collection, error_id_tag="error_id", logger=None):
+        self.collection = collection
+        self.error_id_tag = error_id_tag
+        self.logger = logger or logging.getLogger(__name__)
+
+    def _error_id(self, event):
+        for tag in event.get("tags") or []:
+            if isinstance(tag, (list, tuple)) and len(tag) == 2 and tag[0] == self.error_id_tag:
+                return str(tag[1])
+        return None
+
+    @staticmethod
+    def _issue_from_event(event):
+        exceptions = (event.get("exception") or {}).get("values") or []
+        unhandled = any((value.get("mechanism") or {}).get("handled") is False for value in exceptions)
+        return {
+            "id": str(event.get("issue_id", "")),
+            "title": event.get("title", "Title not available"),
+            "metadata": {"value": (event.get("metadata") or {}).get("value", "Value not available")},
+            "isUnhandled": unhandled,
+            "lastSeen": event.get("datetime") or datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def ingest(self, resource, payload):
+        """Store what a webhook tells us. Returns the number of error IDs written."""
+        data = payload.get("data") or {}
+
+        if resource == "issue" and "issue" in data:
+            issue = data["issue"]
+            fields = {f"issue.{key}": issue[key] for key in ("title", "lastSeen") if key in issue}
+            if fields:
+                await self.collection.update_many({"issue.id": str(issue.get("id"))}, {"$set": fields})
+            return 0
+
+        event = data.get("error") if resource == "error" else data.get("event") if resource == "event_alert" else None
+        if not event:
+            return 0
+
+        error_id = self._error_id(event)
+        if error_id is None:
+            return 0
+
+        await self.collection.update_one(
+            {"_id": error_id},
+            {"$set": {"issue": self._issue_from_event(event), "received_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+        self.logger.info(f"Indexed Sentry error ID {error_id}.")
+        return 1
+
+    async def lookup(self, error_id):
+        """Return ``[issue]`` like the Sentry search API would, or None on a miss."""
+        document = await self.collection.find_one({"_id": error_id}, {"issue": 1})
+        return [document["issue"]] if document else None
+
+
+class SentryWebhookServer:
+    """A small aiohttp server that verifies Sentry webhook signatures and feeds a SentryErrorIndex."""
+
+    def __init__(self, index, secret, host="0.0.0.0", port=80, path="/sentry/webhook", logger=None):
+        self.index = index
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.path = path
+        self.logger = logger or logging.getLogger(__name__)
+        self.runner = None
+
+    def verify(self, signature, body):
+        return bool(signature) and hmac.compare_digest(sign_payload(self.secret, body), signature)
+
+    async def handle_webhook(self, request):
+        body = await request.read()
+        if not self.verify(request.headers.get(SIGNATURE_HEADER, ""), body):
+            self.logger.warning("Rejected a Sentry webhook with a bad signature.")
+            return web.Response(status=401)
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return web.Response(status=400)
+
+        stored = await self.index.ingest(request.headers.get(RESOURCE_HEADER, ""), payload)
+        return web.json_response({"stored": stored})
+
+    @staticmethod
+    async def handle_health(_request):
+        return web.Response(text="ok")
+
+    async def start(self):
+        app = web.Application(client_max_size=4 * 1024 * 1024)
+        app.router.add_post(self.path, self.handle_webhook)
+        app.router.add_get("/health", self.handle_health)
+
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, self.host, self.port).start()
+        self.logger.info(f"Sentry webhook server listening on {self.host}:{self.port}{self.path}")
+
+    async def stop(self):
+        if self.runner is not None:
+            await self.runner.cleanup()
+            self.runner = None
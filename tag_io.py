@@ -0,0 +1,241 @@
+import codecs
+import json
+import tempfile
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+EXPORT_FIELDS = ("name", "content", "author_id")
+CONFLICT_POLICIES = ("skip", "overwrite", "fail")
+DUPLICATE_KEY_ERROR = 11000
+
+
+class TagImportError(Exception):
+    """Raised when an import file cannot be parsed."""
+
+
+class TagImportSummary:
+    """Counts what an import did to the tag collection."""
+
+    def __init__(self, policy, ordered):
+        self.policy = policy
+        self.ordered = ordered
+        self.read = 0
+        self.created = 0
+        self.updated = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.invalid = 0
+        self.conflicts = []
+        self.aborted = False
+
+    @property
+    def written(self):
+        """Tags this import created or changed so far."""
+        return self.created + self.updated
+
+    def lines(self):
+        lines = [
+            f"**Read:** {self.read}",
+            f"**Created:** {self.created}",
+            f"**Updated:** {self.updated}",
+            f"**Unchanged:** {self.unchanged}",
+            f"**Skipped (already existed):** {self.skipped}",
+            f"**Invalid records:** {self.invalid}",
+        ]
+        if self.conflicts:
+            shown = ", ".join(f"`{name}`" for name in self.conflicts[:20])
+            more = f" and {len(self.conflicts) - 20} more" if len(self.conflicts) > 20 else ""
+            lines.append(f"**Conflicts:** {shown}{more}")
+        if self.aborted and self.ordered:
+            lines.append("**Import stopped at the first conflict.**")
+        elif self.aborted:
+            lines.append("**Import stopped after the batch with the first conflict; the rest of that batch was "
+                         "still written.**")
+        return lines
+
+
+def _export_document(tag):
+    return {field: tag[field] for field in EXPORT_FIELDS if field in tag}
+
+
+async def export_tags(collection, guild_id, file_format="json", spool_size=1024 * 1024):
+    """Stream a guild's tags from a cursor into a spooled file and return it rewound.
+
+    Documents are written one at a time, so memory stays flat until the file grows past ``spool_size``.
+    """
+    export_file = tempfile.SpooledTemporaryFile(max_size=spool_size, mode="w+b")
+    projection = {"_id": 0, **{field: 1 for field in EXPORT_FIELDS}}
+    cursor = collection.find({"guild_id": guild_id}, projection).sort("name", 1)
+    count = 0
+
+    if file_format == "json":
+        export_file.write(b"[")
+
+    async for tag in cursor:
+        encoded = json.dumps(_export_document(tag), ensure_ascii=False).encode("utf-8")
+        if file_format == "json":
+            export_file.write(b",\n  " if count else b"\n  ")
+            export_file.write(encoded)
+        else:
+            export_file.write(encoded + b"\n")
+        count += 1
+
+    if file_format == "json":
+        export_file.write(b"\n]\n" if count else b"]\n")
+
+    export_file.seek(0)
+    return export_file, count
+
+
+class TagRecordDecoder:
+    """Incrementally decodes tag objects from a JSON array or NDJSON byte stream."""
+
+    def __init__(self, max_buffer=1024 * 1024):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._max_buffer = max_buffer
+        self._started = False
+        self._array = False
+        self._finished = False
+
+    def feed(self, chunk, final=False):
+        """Feed raw bytes and return every complete record decoded so far."""
+        self._buffer += self._text.decode(chunk, final=final)
+        records = []
+        index = 0
+        length = len(self._buffer)
+
+        while True:
+            separators = " \t\r\n" if self._finished else " \t\r\n,"
+            while index < length and self._buffer[index] in separators:
+                index += 1
+            if index >= length:
+                break
+            if self._finished:
+                raise TagImportError(f"Unexpected data after the JSON array: {self._buffer[index:index + 20]!r}.")
+
+            if not self._started:
+                self._started = True
+                if self._buffer[index] == "[":
+                    self._array = True
+                    index += 1
+                    continue
+
+            if self._array and self._buffer[index] == "]":
+                self._finished = True
+                index += 1
+                continue
+
+            if self._buffer[index] != "{":
+                raise TagImportError(f"Expected a tag object, found {self._buffer[index:index + 20]!r}.")
+
+            try:
+                record, index = self._decoder.raw_decode(self._buffer, index)
+            except json.JSONDecodeError as e:
+                if final:
+                    raise TagImportError(f"Malformed JSON: {e.msg}.") from e
+                break
+            records.append(record)
+
+        self._buffer = self._buffer[index:]
+        if len(self._buffer) > self._max_buffer:
+            raise TagImportError("A single tag record is too large.")
+        if final and self._array and not self._finished:
+            raise TagImportError("The JSON array is not closed.")
+        return records
+
+
+def validate_record(record):
+    """Return a clean tag document, or None if the record is unusable."""
+    name = record.get("name")
+    content = record.get("content")
+    if not isinstance(name, str) or not name.strip() or not isinstance(content, str) or not content:
+        return None
+
+    name = name.strip()
+    document = {"name": name, "name_lower": name.lower(), "content": content}
+    author_id = record.get("author_id")
+    if isinstance(author_id, int):
+        document["author_id"] = author_id
+    return document
+
+
+def _build_operation(document, policy):
+    if policy == "fail":
+        return InsertOne(document)
+    # Names are unique per guild regardless of case, like create_tag enforces.
+    query = {"guild_id": document["guild_id"], "name_lower": document["name_lower"]}
+    if policy == "overwrite":
+        return UpdateOne(query, {"$set": document}, upsert=True)
+    return UpdateOne(query, {"$setOnInsert": document}, upsert=True)
+
+
+def _count(summary, created, matched, modified):
+    summary.created += created
+    if summary.policy == "overwrite":
+        summary.updated += modified
+        summary.unchanged += matched - modified
+    elif summary.policy == "skip":
+        summary.skipped += matched
+
+
+async def apply_batch(collection, documents, summary):
+    """Apply one batch with a single bulk_write and fold the result into ``summary``."""
+    if not documents:
+        return
+
+    operations = [_build_operation(document, summary.policy) for document in documents]
+    try:
+        result = await collection.bulk_write(operations, ordered=summary.ordered)
+    except BulkWriteError as e:
+        details = e.details
+        _count(summary, details.get("nInserted", 0) + details.get("nUpserted", 0),
+               details.get("nMatched", 0), details.get("nModified", 0))
+        for error in details.get("writeErrors", []):
+            if error.get("code") != DUPLICATE_KEY_ERROR:
+                raise
+            summary.conflicts.append(documents[error["index"]]["name"])
+        summary.aborted = summary.policy == "fail"
+        return
+
+    _count(summary, result.inserted_count + result.upserted_count, result.matched_count, result.modified_count)
+
+
+async def import_tags(collection, guild_id, chunks, policy="skip", ordered=False, batch_size=500, summary=None):
+    """Parse ``chunks`` (an async iterator of bytes) and write them as ``guild_id``'s tags in bulk_write batches.
+
+    Batches are written as they fill, so an error can stop an import partway. Pass a ``summary`` to know
+    what was written before it.
+    """
+    if policy not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy '{policy}'.")
+
+    summary = summary or TagImportSummary(policy, ordered)
+    decoder = TagRecordDecoder()
+    batch = []
+
+    async def _consume(records):
+        for record in records:
+            summary.read += 1
+            document = validate_record(record) if isinstance(record, dict) else None
+            if document is None:
+                summary.invalid += 1
+                continue
+            document["guild_id"] = guild_id
+            batch.append(document)
+            if len(batch) >= batch_size:
+                await apply_batch(collection, batch, summary)
+                batch.clear()
+                if summary.aborted:
+                    return
+
+    async for chunk in chunks:
+        await _consume(decoder.feed(chunk))
+        if summary.aborted:
+            return summary
+
+    await _consume(decoder.feed(b"", final=True))
+    if not summary.aborted:
+        await apply_batch(collection, batch, summary)
+    return summary
@@ -0,0 +1,88 @@
+import heapq
+import math
+import re
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class TagSearchIndex:
+    """An in-memory inverted index over tag names and content, ranked with BM25.
+
+    Name terms are counted ``name_weight`` times so a tag called "verify" outranks one that merely mentions it.
+    Every update touches only the postings of the tag being changed.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, name_weight=3, snippet_length=100):
+        self.k1 = k1
+        self.b = b
+        self.name_weight = name_weight
+        self.snippet_length = snippet_length
+        self.postings = {}
+        self.documents = {}
+        self.lengths = {}
+        self.snippets = {}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _terms(self, name, content):
+        terms = Counter(tokenize(content))
+        for term in tokenize(name):
+            terms[term] += self.name_weight
+        return terms
+
+    def add(self, name, content):
+        """Index a tag, replacing any previous version of it."""
+        self.remove(name)
+        terms = self._terms(name, content)
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[name] = frequency
+        self.documents[name] = terms
+        self.lengths[name] = sum(terms.values())
+        self.snippets[name] = content[:self.snippet_length]
+        self.total_length += self.lengths[name]
+
+    def remove(self, name):
+        terms = self.documents.pop(name, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self.postings[term]
+            del postings[name]
+            if not postings:
+                del self.postings[term]
+        self.snippets.pop(name, None)
+        self.total_length -= self.lengths.pop(name)
+
+    def clear(self):
+        self.postings.clear()
+        self.documents.clear()
+        self.lengths.clear()
+        self.snippets.clear()
+        self.total_length = 0
+
+    def search(self, query, limit=10):
+        """Return up to ``limit`` ``(name, score)`` pairs, best match first."""
+        document_count = len(self.documents)
+        if not document_count:
+            return []
+
+        average_length = self.total_length / document_count
+        scores = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for name, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[name] / average_length)
+                scores[name] = scores.get(name, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime, timezone
+from pymongo import DESCENDING, UpdateOne
+from pymongo.errors import PyMongoError
+
+
+class TagUsageTracker:
+    """Accumulates tag hits in memory and writes them behind with one bulk_write per flush.
+
+    Counters are keyed by ``(guild_id, tag_name)``. A crash loses at most the hits recorded since the last flush.
+    """
+
+    def __init__(self, collection, logger=None):
+        self.collection = collection
+        self.logger = logger or logging.getLogger(__name__)
+        self.pending = {}
+
+    def record(self, guild_id, tag_name):
+        """Count one use of ``tag_name`` in ``guild_id``. Never touches the database."""
+        key = (guild_id, tag_name)
+        count, _ = self.pending.get(key, (0, None))
+        self.pending[key] = (count + 1, datetime.now(timezone.utc))
+
+    def _restore(self, batch):
+        for key, (count, last_used) in batch.items():
+            pending_count, pending_last_used = self.pending.get(key, (0, last_used))
+            self.pending[key] = (pending_count + count, max(last_used, pending_last_used))
+
+    async def flush(self):
+        """Write every pending counter in one unordered bulk_write. Returns the number of tags flushed."""
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, {}
+        operations = [
+            UpdateOne({"guild_id": guild_id, "name_lower": tag_name.lower()},
+                      {"$inc": {"uses": count}, "$max": {"last_used": last_used}})
+            for (guild_id, tag_name), (count, last_used) in batch.items()
+        ]
+
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            self.logger.error(f"Failed to flush tag usage, keeping {len(batch)} counters for the next flush: {e}")
+            self._restore(batch)
+            return 0
+
+        return len(batch)
+
+    async def top(self, guild_id, limit=10):
+        """Return a guild's most used tags, most used first."""
+        cursor = self.collection.find({"guild_id": guild_id, "uses": {"$gt": 0}},
+                                      {"_id": 0, "name": 1, "uses": 1, "last_used": 1})
+        return await cursor.sort("uses", DESCENDING).limit(limit).to_list(length=limit)
+
+    async def hot_tags(self, limit):
+        """Return the full documents of the ``limit`` most used tags across guilds, for cache pre-warming."""
+        cursor = self.collection.find({}, {"_id": 0}).sort("uses", DESCENDING).limit(limit)
+        return await cursor.to_list(length=limit)
@@ -0,0 +1,51 @@
+import asyncio
+from types import SimpleNamespace
+import discord
+from discord.ext import commands
+from discord.ext.commands.view import StringView
+import main
+from deadline import DeadlineContext
+
+
+class Failing(commands.Cog):
+    @commands.hybrid_command(name="fail")
+    async def fail(self, ctx):
+        raise RuntimeError("boom")
+
+    @commands.hybrid_command(name="succeed")
+    async def succeed(self, ctx):
+        pass
+
+
+def invoke_as_slash(command_name):
+    """Invoke a hybrid command the way the app command tree does and return the bot's in-flight counter."""
+    async def run():
+        bot = main.Bot(command_prefix=main.BOT_PREFIX, intents=discord.Intents.none())
+        # What login() does before dispatching any event; nothing here talks to Discord.
+        await bot._async_setup_hook()
+        await bot.add_cog(Failing())
+        command = bot.get_command(command_name)
+        interaction = SimpleNamespace(client=bot, command_failed=False, namespace=SimpleNamespace())
+        message = SimpleNamespace(_state=bot._connection)
+        ctx = DeadlineContext(message=message, bot=bot, view=StringView(""), interaction=interaction)
+        ctx.command = command
+
+        async def get_context(_origin, /, *, cls=None):
+            return ctx
+
+        bot.get_context = get_context
+        await command.app_command._invoke_with_namespace(interaction, interaction.namespace)
+        # command_error listeners run as separate tasks.
+        for _ in range(5):
+            await asyncio.sleep(0)
+        return bot.in_flight["Failing"]
+
+    return asyncio.run(run())
+
+
+def test_failing_slash_command_is_not_left_in_flight():
+    assert invoke_as_slash("fail") == 0
+
+
+def test_successful_slash_command_is_counted_once():
+    assert invoke_as_slash("succeed") == 0
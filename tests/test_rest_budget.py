@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+import pytest
+from Cogs.support import Support
+from guild_settings import GuildSettings
+from rest_budget import RestBudget
+from work_queue import WorkQueue
+
+REACTION_HANDLER = "event:Support.on_raw_reaction_add"
+
+
+class StubHTTP:
+    """Stands in for HTTPClient.request: records each route and returns without touching the network."""
+
+    def __init__(self, budget):
+        self.routes = []
+        self.request = budget.wrap_request(self._request)
+
+    async def _request(self, route, **kwargs):
+        self.routes.append(route)
+
+
+class StubMessage:
+    def __init__(self, http, message_id):
+        self.http = http
+        self.id = message_id
+        self.jump_url = f"https://discord.com/channels/1/2/{message_id}"
+
+    async def reply(self, **kwargs):
+        await self.http.request("POST /channels/{channel_id}/messages")
+        return StubMessage(self.http, self.id + 1)
+
+
+class StubChannel:
+    def __init__(self, http):
+        self.http = http
+
+    async def fetch_message(self, message_id):
+        await self.http.request("GET /channels/{channel_id}/messages/{message_id}")
+        return StubMessage(self.http, message_id)
+
+    async def send(self, **kwargs):
+        await self.http.request("POST /channels/{channel_id}/messages")
+        return StubMessage(self.http, 99)
+
+
+class StubSettingsStore:
+    def __init__(self, settings):
+        self.settings = settings
+
+    async def get(self, guild_id):
+        return self.settings
+
+
+def make_bot(budget, http):
+    async def fetch_user(user_id):
+        await http.request("GET /users/{user_id}")
+        return SimpleNamespace(id=user_id, bot=False, mention=f"<@{user_id}>")
+
+    async def fetch_channel(channel_id):
+        await http.request("GET /channels/{channel_id}")
+        return StubChannel(http)
+
+    return SimpleNamespace(
+        rest_budget=budget,
+        guild_settings=StubSettingsStore(GuildSettings(1, report_channel_id=3, delete_role_id=4)),
+        fetch_user=fetch_user,
+        fetch_channel=fetch_channel,
+        get_channel=lambda channel_id: StubChannel(http),
+        logger=logging.getLogger(__name__),
+        work_queues={},
+    )
+
+
+def make_cog(bot):
+    cog = Support.__new__(Support)
+    cog.bot = bot
+    cog.last_reaction_times = {}
+    cog.last_report_times = {}
+    return cog
+
+
+def report(budget, max_calls):
+    """Report one message through the listener and its work queue. Returns the stubbed HTTP client."""
+    async def run():
+        http = StubHTTP(budget)
+        bot = make_bot(budget, http)
+        cog = make_cog(bot)
+        queue = bot.work_queues['reports'] = WorkQueue('reports', cog.handle_report, policy='coalesce', timeout=5)
+        queue.start()
+        payload = SimpleNamespace(guild_id=1, channel_id=2, message_id=10, user_id=5, emoji='⚠️')
+        try:
+            with budget.expect(REACTION_HANDLER, max_calls=max_calls):
+                await cog.on_raw_reaction_add(payload)
+                await queue.join()
+        finally:
+            await queue.close()
+        return http
+
+    return asyncio.run(run())
+
+
+def test_report_stays_within_budget_and_is_attributed_to_the_listener():
+    budget = RestBudget()
+    http = report(budget, max_calls=5)
+
+    # Fetch the reporter, the channel and the message, post the report, reply with the delete button.
+    assert len(http.routes) == 5
+    assert budget.stats[REACTION_HANDLER].requests == 5
+    assert "queue:reports" not in budget.stats
+
+
+def test_report_over_budget_fails():
+    with pytest.raises(AssertionError, match="made 5 REST calls, its budget is 4"):
+        report(RestBudget(), max_calls=4)
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import aiohttp
+from sentry_webhook import RESOURCE_HEADER, SIGNATURE_HEADER, SentryErrorIndex, SentryWebhookServer, sign_payload
+
+SECRET = "local-test-secret"
+
+
+class InMemoryCollection:
+    """The subset of a Motor collection SentryErrorIndex uses, keyed by ``_id``."""
+
+    def __init__(self):
+        self.documents = {}
+
+    async def update_one(self, query, update, upsert=False):
+        document = self.documents.get(query["_id"])
+        if document is None and upsert:
+            document = self.documents[query["_id"]] = {"_id": query["_id"]}
+        if document is not None:
+            document.update(update.get("$set", {}))
+
+    async def find_one(self, query, projection=None):
+        return self.documents.get(query["_id"])
+
+
+def error_payload(error_id):
+    return json.dumps({
+        "action": "created",
+        "data": {
+            "error": {
+                "issue_id": 4242,
+                "title": "ZeroDivisionError: division by zero",
+                "metadata": {"value": "division by zero"},
+                "datetime": "2026-10-19T12:00:00Z",
+                "exception": {"values": [{"mechanism": {"handled": False}}]},
+                "tags": [["environment", "production"], ["error_id", error_id]],
+            }
+        },
+    }).encode("utf-8")
+
+
+async def post(session, url, body, signature):
+    headers = {SIGNATURE_HEADER: signature, RESOURCE_HEADER: "error", "Content-Type": "application/json"}
+    async with session.post(url, data=body, headers=headers) as response:
+        return response.status
+
+
+def test_webhook_stores_signed_errors_and_rejects_bad_signatures():
+    async def run():
+        index = SentryErrorIndex(InMemoryCollection())
+        server = SentryWebhookServer(index, SECRET, host="127.0.0.1", port=0)
+        await server.start()
+        try:
+            host, port = server.runner.addresses[0][:2]
+            url = f"http://{host}:{port}{server.path}"
+            async with aiohttp.ClientSession() as session:
+                signed = error_payload("abc123")
+                assert await post(session, url, signed, sign_payload(SECRET, signed)) == 200
+
+                forged = error_payload("forged")
+                assert await post(session, url, forged, sign_payload("wrong-secret", forged)) == 401
+        finally:
+            await server.stop()
+
+        issues = await index.lookup("abc123")
+        assert issues is not None
+        assert issues[0]["id"] == "4242"
+        assert issues[0]["title"] == "ZeroDivisionError: division by zero"
+        assert issues[0]["isUnhandled"] is True
+        assert await index.lookup("forged") is None
+
+    asyncio.run(run())
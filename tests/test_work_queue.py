@@ -0,0 +1,49 @@
+import asyncio
+from work_queue import WorkQueue
+
+
+def test_only_successful_items_count_as_processed():
+    async def run():
+        async def handler(outcome):
+            if outcome == "fail":
+                raise ValueError(outcome)
+            if outcome == "slow":
+                await asyncio.sleep(1)
+
+        queue = WorkQueue("test", handler, concurrency=1, timeout=0.05)
+        queue.start()
+        for outcome in ("ok", "fail", "slow", "ok"):
+            queue.submit(outcome)
+        await queue.join()
+        await queue.close()
+        return queue.stats()
+
+    stats = asyncio.run(run())
+    assert stats["processed"] == 2
+    assert stats["failed"] == 2
+
+
+def test_lost_workers_are_restarted():
+    async def run():
+        handled = []
+
+        async def handler(item):
+            handled.append(item)
+
+        queue = WorkQueue("test", handler, concurrency=2)
+        queue.start()
+        for worker in list(queue.workers):
+            worker.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        restarted = len(queue.workers)
+        queue.submit("after")
+        await asyncio.wait_for(queue.join(), 1)
+        await queue.close()
+        return restarted, handled, len(queue.workers)
+
+    restarted, handled, remaining = asyncio.run(run())
+    assert restarted == 2
+    assert handled == ["after"]
+    assert remaining == 0
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+import discord
+from discord.utils import snowflake_time
+from pymongo import ASCENDING, DeleteOne, UpdateOne
+from pymongo.errors import PyMongoError
+
+ARCHIVED = "archived"
+ALREADY_ARCHIVED = "already_archived"
+ACTIVE = "active"
+GONE = "gone"
+
+
+class ThreadSweeper:
+    """Tracks support thread activity in the ``threads`` collection and closes idle threads in batches.
+
+    Activity from gateway events is buffered in memory and written with one bulk_write before every sweep.
+    A sweep finds idle threads with a single indexed range query, then archives them a few at a time so the
+    channel edit rate limit is never hit in a burst. One sweeper serves every guild; callers pass the support
+    forum from that guild's settings.
+    """
+
+    def __init__(self, bot, collection, config, logger=None):
+        self.bot = bot
+        self.collection = collection
+        self.logger = logger or logging.getLogger(__name__)
+        self.idle_after = timedelta(hours=config.get("THREAD_IDLE_HOURS", 48))
+        self.batch_size = config.get("THREAD_SWEEP_BATCH_SIZE", 5)
+        self.batch_delay = config.get("THREAD_SWEEP_BATCH_DELAY_SECONDS", 2)
+        self.max_per_sweep = config.get("THREAD_SWEEP_MAX_PER_RUN", 500)
+        self.lock = config.get("THREAD_SWEEP_LOCK", True)
+        self.pending = {}
+
+    @staticmethod
+    def is_tracked(channel, forum_id):
+        return forum_id is not None and isinstance(channel, discord.Thread) and channel.parent_id == forum_id
+
+    def track(self, thread, activity=None, archived=False):
+        """Buffer a thread's latest state. Never touches the database."""
+        entry = self.pending.setdefault(thread.id, {"guild_id": thread.guild.id, "parent_id": thread.parent_id})
+        entry["archived"] = archived
+        if activity is not None:
+            entry["last_activity"] = max(activity, entry.get("last_activity", activity))
+
+    async def forget(self, thread_id):
+        self.pending.pop(thread_id, None)
+        await self.collection.delete_one({"_id": thread_id})
+
+    async def flush(self):
+        """Write every buffered thread update in one unordered bulk_write."""
+        if not self.pending:
+            return 0
+
+        batch, self.pending = self.pending, {}
+        operations = []
+        for thread_id, entry in batch.items():
+            update = {"$set": {key: value for key, value in entry.items() if key != "last_activity"}}
+            if "last_activity" in entry:
+                update["$max"] = {"last_activity": entry["last_activity"]}
+            operations.append(UpdateOne({"_id": thread_id}, update, upsert=True))
+
+        try:
+            await self.collection.bulk_write(operations, ordered=False)
+        except PyMongoError as e:
+            self.logger.error(f"Failed to flush thread activity, keeping {len(batch)} updates: {e}")
+            for thread_id, entry in batch.items():
+                self.pending.setdefault(thread_id, entry)
+            return 0
+        return len(operations)
+
+    async def backfill(self, guild, forum_id):
+        """Track every active thread in the forum with a single REST call, e.g. after downtime."""
+        for thread in await guild.active_threads():
+            if self.is_tracked(thread, forum_id):
+                self.track(thread, activity=snowflake_time(thread.last_message_id or thread.id))
+        await self.flush()
+
+    async def _close(self, guild, thread_id, cutoff):
+        thread = guild.get_thread(thread_id) if guild else None
+        if thread is None:
+            try:
+                thread = await self.bot.fetch_channel(thread_id)
+            except discord.NotFound:
+                return GONE
+
+        if thread.last_message_id and snowflake_time(thread.last_message_id) >= cutoff:
+            # Activity the buffer lost (e.g. across a restart): keep the thread open and record it.
+            self.track(thread, activity=snowflake_time(thread.last_message_id))
+            return ACTIVE
+
+        if thread.archived:
+            return ALREADY_ARCHIVED
+        await thread.edit(archived=True, locked=self.lock, reason="Closed after inactivity.")
+        return ARCHIVED
+
+    async def sweep(self, guild, forum_id):
+        """Archive every idle thread in ``forum_id``. Returns the IDs of the threads that were closed."""
+        await self.flush()
+
+        cutoff = datetime.now(timezone.utc) - self.idle_after
+        cursor = self.collection.find(
+            {"parent_id": forum_id, "archived": False, "last_activity": {"$lt": cutoff}},
+            {"_id": 1},
+        ).sort("last_activity", ASCENDING).limit(self.max_per_sweep)
+        thread_ids = [document["_id"] async for document in cursor]
+
+        closed, operations = [], []
+        for start in range(0, len(thread_ids), self.batch_size):
+            if start:
+                await asyncio.sleep(self.batch_delay)
+
+            batch = thread_ids[start:start + self.batch_size]
+            results = await asyncio.gather(*(self._close(guild, thread_id, cutoff) for thread_id in batch),
+                                           return_exceptions=True)
+
+            for thread_id, result in zip(batch, results):
+                if result in (ARCHIVED, ALREADY_ARCHIVED):
+                    operations.append(UpdateOne({"_id": thread_id}, {"$set": {"archived": True}}))
+                    if result == ARCHIVED:
+                        closed.append(thread_id)
+                elif result == GONE:
+                    operations.append(DeleteOne({"_id": thread_id}))
+                elif isinstance(result, Exception):
+                    self.logger.error(f"Failed to close thread {thread_id}: {result}")
+
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+        await self.flush()
+        return closed
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from rest_budget import RestBudget, current_handler
+
+POLICIES = ("drop", "coalesce")
+
+
+class WorkQueue:
+    """A bounded queue drained by a fixed pool of supervised workers.
+
+    Event listeners submit work instead of doing it, so a burst of gateway events costs at most ``maxsize``
+    queued items and ``concurrency`` running handlers. When the queue is full new work is dropped. With the
+    ``coalesce`` policy, work submitted under a key that is already queued replaces the queued arguments
+    instead of taking another slot, so the handler only sees the latest event for that key. REST calls made
+    by the handler are attributed to whoever submitted the work, e.g. ``event:Support.on_raw_reaction_add``.
+    A worker that exits for any reason other than ``close`` is replaced, so the pool keeps its size.
+    """
+
+    def __init__(self, name, handler, maxsize=100, concurrency=2, policy="drop", timeout=None, logger=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown work queue policy '{policy}'.")
+
+        self.name = name
+        self.handler = handler
+        self.maxsize = maxsize
+        self.concurrency = concurrency
+        self.policy = policy
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.queue = asyncio.Queue(maxsize)
+        self.keyed = {}
+        self.workers = set()
+        self.closed = False
+        self.active = 0
+        self.processed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def start(self):
+        for _ in range(self.concurrency - len(self.workers)):
+            worker = asyncio.create_task(self._work(), name=f"work-queue:{self.name}")
+            self.workers.add(worker)
+            worker.add_done_callback(self._worker_done)
+
+    def _worker_done(self, worker):
+        self.workers.discard(worker)
+        if self.closed:
+            return
+        error = None if worker.cancelled() else worker.exception()
+        self.logger.error(f"Work queue '{self.name}' lost a worker ({error or 'cancelled'}), restarting it.")
+        self.start()
+
+    def submit(self, *args, key=None):
+        """Queue ``handler(*args)`` without waiting. Returns False if the work was dropped."""
+        if self.closed:
+            self.dropped += 1
+            return False
+
+        work = (current_handler.get(), args)
+        if self.policy == "coalesce" and key is not None and key in self.keyed:
+            self.keyed[key] = work
+            self.coalesced += 1
+            return True
+
+        if self.queue.full():
+            self.dropped += 1
+            if self.dropped % 100 == 1:
+                self.logger.warning(f"Work queue '{self.name}' is full; {self.dropped} items dropped so far.")
+            return False
+
+        if self.policy == "coalesce" and key is not None:
+            self.keyed[key] = work
+            self.queue.put_nowait((key, None))
+        else:
+            self.queue.put_nowait((None, work))
+        return True
+
+    async def join(self):
+        """Wait until everything queued so far has been handled."""
+        await self.queue.join()
+
+    async def _work(self):
+        while True:
+            key, work = await self.queue.get()
+            self.active += 1
+            try:
+                if key is not None:
+                    work = self.keyed.pop(key)
+                handler_name, args = work
+                with RestBudget.attributed(handler_name):
+                    await asyncio.wait_for(self.handler(*args), self.timeout)
+                self.processed += 1
+            except asyncio.TimeoutError:
+                self.failed += 1
+                self.logger.error(f"Work queue '{self.name}' handler timed out after {self.timeout}s.")
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"Work queue '{self.name}' handler failed: {e}")
+            finally:
+                self.active -= 1
+                self.queue.task_done()
+
+    async def close(self, timeout=5):
+        """Stop accepting work, give queued work ``timeout`` seconds to finish, then cancel the workers."""
+        self.closed = True
+        try:
+            await asyncio.wait_for(self.join(), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Work queue '{self.name}' closed with {self.queue.qsize()} items unprocessed.")
+
+        workers = list(self.workers)
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self):
+        return {
+            "depth": self.queue.qsize(),
+            "maxsize": self.maxsize,
+            "active": self.active,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }